@@ -0,0 +1,397 @@
+"""
+ワーカー数ごとに処理できるセッション数を計測する負荷計測
+実際のワーカープロセスとShardProxyを起動し、FletのWebSocketプロトコルで
+模擬クライアントを接続する。python -m src.benchmark で実行する
+"""
+import asyncio
+import json
+import logging
+import math
+import multiprocessing
+import os
+import re
+import socket
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# websocketsは負荷計測でのみ必要なため任意の依存とする
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+from .utils.sharding import Backend, ShardProxy, start_workers, stop_workers
+
+logger = logging.getLogger(__name__)
+
+
+# 負荷計測の模擬クライアントが送信する端末情報
+_CLIENT_DETAILS = {
+    "pageName": "",
+    "pageRoute": "/",
+    "pageWidth": "400",
+    "pageHeight": "600",
+    "windowWidth": "400",
+    "windowHeight": "600",
+    "windowTop": "0",
+    "windowLeft": "0",
+    "isPWA": "false",
+    "isWeb": "true",
+    "isDebug": "false",
+    "platform": "linux",
+    "platformBrightness": "dark",
+    "media": "{}",
+    "sessionId": "",
+}
+
+# タイマー開始時の開始ボタンの更新メッセージ
+_PAUSE_ICON = re.compile(r'"icon":"pause"')
+
+# 時間表示（"MM:SS"）の更新メッセージ
+_DISPLAY_UPDATE = re.compile(r'"value":"\d{2}:\d{2}"')
+
+# 時間表示は毎秒更新されるため、これより間隔が空いたセッションは遅延とみなす
+MAX_UPDATE_GAP = 1.5
+
+
+class CapacityResult(NamedTuple):
+    """ワーカー数ごとの負荷計測の結果"""
+    workers: int
+    sessions: int              # 全セッションが遅延なく更新された最大のセッション数
+    sessions_per_core: float   # ワーカー1プロセス（1コア）あたりのセッション数
+    proxy_cpu: float           # その時のプロキシのCPU使用率（1.0で1コア分）
+    proxy_ceiling: float       # プロキシが1コアを使い切る時のセッション数（推定）
+    client_cpu: float          # その時の模擬クライアントのCPU使用率
+
+
+class _Window:
+    """全セッションの接続後に決まる計測期間"""
+
+    def __init__(self):
+        self.start = math.inf
+        self.end = math.inf
+
+
+def _find_start_button(batch: List[Dict]) -> Optional[str]:
+    """初期表示のコントロールから開始ボタンのIDを探す"""
+    for command in batch:
+        if command.get("action") != "addPageControls":
+            continue
+        for control in command["payload"]["controls"]:
+            if control.get("t") == "iconbutton" and control.get("icon") == "play_arrow":
+                return control["i"]
+    return None
+
+
+async def _open_session(url: str):
+    """
+    セッションを開始してタイマーの開始ボタンを押す
+    Args:
+        url: WebSocketのURL
+    Returns:
+        接続済みのWebSocket
+    """
+    ws = await websockets.connect(url, max_size=None, ping_interval=None)
+    try:
+        await ws.send(json.dumps(
+            {"action": "registerWebClient", "payload": _CLIENT_DETAILS}
+        ))
+        button = None
+        while button is None:
+            message = json.loads(await ws.recv())
+            if message["action"] == "pageControlsBatch":
+                button = _find_start_button(message["payload"])
+        # 初期表示の送信直後はコントロールがまだ登録されておらず、クリックが
+        # 無視される場合があるため、一時停止アイコンに変わるまで送り直す
+        click = json.dumps({
+            "action": "pageEventFromWeb",
+            "payload": {"eventTarget": button, "eventName": "click", "eventData": ""},
+        })
+        started = False
+        while not started:
+            await ws.send(click)
+            try:
+                while not started:
+                    message = await asyncio.wait_for(ws.recv(), 1.0)
+                    started = _PAUSE_ICON.search(message) is not None
+            except asyncio.TimeoutError:
+                continue
+    except BaseException:
+        await ws.close()
+        raise
+    return ws
+
+
+async def _run_session(
+    url: str,
+    window: _Window,
+    semaphore: asyncio.Semaphore,
+    connect_timeout: float,
+    on_connected: Callable[[], None]
+) -> float:
+    """
+    1つの模擬クライアントセッションを実行する
+    Returns:
+        計測期間中の時間表示の更新間隔の最大値（秒、開始できなかった場合は無限大）
+    """
+    try:
+        async with semaphore:
+            ws = await asyncio.wait_for(_open_session(url), connect_timeout)
+    except Exception as e:
+        logger.debug(f"セッションを開始できませんでした: {str(e)}")
+        return math.inf
+    finally:
+        on_connected()
+
+    loop = asyncio.get_running_loop()
+    last: Optional[float] = None
+    max_gap = 0.0
+    try:
+        while loop.time() < window.end:
+            try:
+                message = await asyncio.wait_for(
+                    ws.recv(), min(window.end - loop.time(), 1.0)
+                )
+            except asyncio.TimeoutError:
+                continue
+            if not _DISPLAY_UPDATE.search(message):
+                continue
+            now = loop.time()
+            if last is not None and now >= window.start:
+                max_gap = max(max_gap, now - last)
+            last = now
+    except websockets.ConnectionClosed:
+        return math.inf
+    finally:
+        await ws.close()
+
+    if last is None:
+        return math.inf
+    return max(max_gap, window.end - last)
+
+
+async def _measure_sessions(
+    url: str,
+    sessions: int,
+    warmup: float,
+    duration: float,
+    connect_timeout: float,
+    concurrency: int,
+    sample_cpu: Callable[[], Tuple[float, float]]
+) -> Tuple[List[float], float, float]:
+    """
+    模擬クライアントを接続し、全セッションの接続後の一定期間の更新間隔を計測する
+    Returns:
+        (セッションごとの最大更新間隔, プロキシのCPU使用率, クライアントのCPU使用率)
+    """
+    loop = asyncio.get_running_loop()
+    window = _Window()
+    semaphore = asyncio.Semaphore(concurrency)
+    connected = asyncio.Event()
+    pending = [sessions]
+
+    def on_connected():
+        pending[0] -= 1
+        if pending[0] == 0:
+            connected.set()
+
+    tasks = [
+        asyncio.create_task(
+            _run_session(url, window, semaphore, connect_timeout, on_connected)
+        )
+        for _ in range(sessions)
+    ]
+    await connected.wait()
+
+    window.start = loop.time() + warmup
+    window.end = window.start + duration
+    samples = []
+    loop.call_at(window.start, lambda: samples.append(sample_cpu()))
+    loop.call_at(window.end, lambda: samples.append(sample_cpu()))
+
+    gaps = await asyncio.gather(*tasks)
+    while len(samples) < 2:
+        await asyncio.sleep(0.1)
+    (proxy_start, client_start), (proxy_end, client_end) = samples
+    return (
+        gaps,
+        (proxy_end - proxy_start) / duration,
+        (client_end - client_start) / duration,
+    )
+
+
+def _run_proxy(backends: List[Backend], host: str, port: int, conn):
+    """
+    計測用にプロキシを別プロセスで起動する
+    親プロセスから要求されるたびにCPU時間を返し、Falseを受け取ると終了する
+    """
+    async def serve():
+        proxy = ShardProxy(backends)
+        server = await asyncio.start_server(proxy.handle, host, port)
+        loop = asyncio.get_running_loop()
+        conn.send(time.process_time())
+        while await loop.run_in_executor(None, conn.recv):
+            conn.send(time.process_time())
+        server.close()
+
+    asyncio.run(serve())
+
+
+def _wait_until_listening(host: str, port: int, timeout: float):
+    """指定したポートで接続を受け付けるまで待つ"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with socket.create_connection((host, port), timeout=1.0):
+                return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{host}:{port} が起動しませんでした")
+            time.sleep(0.2)
+
+
+def _run_step(
+    run_worker: Callable[[int], None],
+    workers: int,
+    sessions: int,
+    host: str,
+    port: int,
+    base_port: int,
+    warmup: float,
+    duration: float,
+    connect_timeout: float,
+    concurrency: int
+) -> Tuple[int, float, float]:
+    """
+    ワーカーとプロキシを起動し、指定したセッション数で計測する
+    Returns:
+        (遅延なく更新されたセッション数, プロキシのCPU使用率, クライアントのCPU使用率)
+    """
+    context = multiprocessing.get_context("spawn")
+    backends = [(host, base_port + i) for i in range(workers)]
+    processes = start_workers(run_worker, workers, base_port)
+    parent_conn, child_conn = context.Pipe()
+    proxy = context.Process(
+        target=_run_proxy,
+        args=(backends, host, port, child_conn),
+        daemon=True,
+    )
+    proxy.start()
+    try:
+        parent_conn.recv()
+        for backend_host, backend_port in backends:
+            _wait_until_listening(backend_host, backend_port, 60.0)
+
+        def sample_cpu() -> Tuple[float, float]:
+            parent_conn.send(True)
+            return parent_conn.recv(), time.process_time()
+
+        gaps, proxy_cpu, client_cpu = asyncio.run(_measure_sessions(
+            f"ws://{host}:{port}/ws",
+            sessions,
+            warmup,
+            duration,
+            connect_timeout,
+            concurrency,
+            sample_cpu,
+        ))
+    finally:
+        # ワーカーを先に停止し、中継中の接続が閉じてからプロキシを停止する
+        stop_workers(processes)
+        if proxy.is_alive():
+            parent_conn.send(False)
+            proxy.join(5)
+    on_time = sum(1 for gap in gaps if gap <= MAX_UPDATE_GAP)
+    return on_time, proxy_cpu, client_cpu
+
+
+def benchmark_capacity(
+    run_worker: Callable[[int], None],
+    max_workers: int = 0,
+    start_sessions: int = 25,
+    max_sessions: int = 6400,
+    warmup: float = 3.0,
+    duration: float = 10.0,
+    host: str = "127.0.0.1",
+    port: int = 8650,
+    base_port: int = 8700,
+    connect_timeout: float = 30.0,
+    concurrency: int = 50
+) -> List[CapacityResult]:
+    """
+    ワーカー数ごとに、実際のワーカープロセスとShardProxyを起動して
+    模擬クライアントのセッションを接続し、処理できるセッション数を計測する
+    各セッションはFletのWebSocketプロトコルで接続してタイマーを開始し、
+    計測期間中に時間表示の更新が1.5秒以上途切れなかったものを遅延なしとする。
+    セッション数は倍々に増やし、99%以上が遅延なしだった最大の数を結果とする。
+    プロキシは別プロセスで起動し、そのCPU使用率から1コアで中継できる
+    セッション数の上限（proxy_ceiling）を推定する。模擬クライアントは計測する
+    プロセス自身で動作するため、client_cpuが1.0に近い場合はクライアント側が
+    上限になっている
+    Args:
+        run_worker: ポート番号を受け取ってアプリを起動する関数
+        max_workers: 計測する最大ワーカー数（0以下の場合はCPUコア数）
+        start_sessions: 最初に計測するセッション数
+        max_sessions: 計測する最大セッション数
+        warmup: 全セッションの接続後、計測を始めるまでの時間（秒）
+        duration: 計測時間（秒）
+        host: プロキシとワーカーが待ち受けるホスト
+        port: プロキシのポート
+        base_port: 最初のワーカーのポート
+        connect_timeout: 1セッションの開始を待つ最大時間（秒）
+        concurrency: 同時に開始処理を行うセッション数
+    Returns:
+        ワーカー数ごとの計測結果のリスト
+    """
+    if websockets is None:
+        raise RuntimeError("負荷計測にはwebsocketsが必要です")
+
+    max_workers = max_workers if max_workers > 0 else (os.cpu_count() or 1)
+    # 1, 2, 4, ... と倍々に増やし、最後に最大ワーカー数で計測する
+    counts = [1]
+    while counts[-1] * 2 < max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+
+    results = []
+    for workers in counts:
+        result = CapacityResult(workers, 0, 0.0, 0.0, 0.0, 0.0)
+        sessions = start_sessions
+        while sessions <= max_sessions:
+            on_time, proxy_cpu, client_cpu = _run_step(
+                run_worker, workers, sessions, host, port, base_port,
+                warmup, duration, connect_timeout, concurrency,
+            )
+            logger.info(
+                f"ワーカー数 {workers}、セッション数 {sessions}: "
+                f"遅延なし {on_time}、プロキシCPU {proxy_cpu:.0%}、"
+                f"クライアントCPU {client_cpu:.0%}"
+            )
+            if on_time < sessions * 0.99:
+                break
+            result = CapacityResult(
+                workers,
+                sessions,
+                sessions / workers,
+                proxy_cpu,
+                sessions / proxy_cpu if proxy_cpu > 0 else math.inf,
+                client_cpu,
+            )
+            sessions *= 2
+        results.append(result)
+    return results
+
+
+if __name__ == "__main__":
+    # python -m src.benchmark で実行する
+    from .main import run_worker
+
+    for result in benchmark_capacity(run_worker):
+        print(
+            f"ワーカー数 {result.workers:3d}: {result.sessions:6d} セッション"
+            f"（1コアあたり {result.sessions_per_core:,.0f}）"
+            f" プロキシCPU {result.proxy_cpu:.0%}"
+            f"（上限 約{result.proxy_ceiling:,.0f} セッション）"
+            f" クライアントCPU {result.client_cpu:.0%}"
+        )
@@ -0,0 +1,85 @@
+import flet as ft
+from typing import Callable, Optional, Sequence
+
+from ..utils.color_transition import ColorTransition
+
+class FocusBackground(ft.Container):
+    """集中モード時に背景色がゆっくりと変化する背景コンテナ"""
+
+    def __init__(
+        self,
+        content: ft.Control,
+        base_color: str,
+        palette: Sequence[str],
+        segment_seconds: float = 30,
+        max_fps: int = 10,
+        client_animation: bool = True,
+        on_unmount: Optional[Callable[[], None]] = None
+    ):
+        """
+        背景コンテナの初期化
+        Args:
+            content (ft.Control): 背景の上に表示するコントロール
+            base_color (str): 通常モード時の背景色
+            palette (Sequence[str]): 集中モード時に遷移させる色のリスト
+            segment_seconds (float): 1色あたりの遷移時間（秒）
+            max_fps (int): サーバー側で補間する場合の最大フレームレート
+            client_animation (bool): クライアント側アニメーションを使う場合True
+            on_unmount (Callable): ページから外された時に呼び出されるコールバック
+        """
+        super().__init__()
+
+        # コンテナの基本設定
+        self.content = content
+        self.alignment = ft.alignment.center
+        self.expand = True
+        self.base_color = base_color
+        self.bgcolor = base_color
+        self.on_unmount = on_unmount
+
+        # トランジションの設定
+        self.transition = ColorTransition(
+            apply=self._apply_color,
+            palette=palette,
+            segment_seconds=segment_seconds,
+            max_fps=max_fps,
+            client_animation=client_animation
+        )
+
+    def _apply_color(self, color: str, duration_ms: int):
+        """
+        背景色を適用する
+        Args:
+            color (str): 適用する色
+            duration_ms (int): クライアント側のアニメーション時間（ミリ秒）
+        """
+        self.animate = (
+            ft.animation.Animation(duration=duration_ms, curve="easeInOut")
+            if duration_ms > 0 else None
+        )
+        self.bgcolor = color
+        self.update()
+
+    def toggle(self) -> bool:
+        """
+        集中モードを切り替える
+        Returns:
+            bool: 切り替え後に集中モードが有効な場合True
+        """
+        if self.is_focus_mode:
+            self.transition.stop()
+            self._apply_color(self.base_color, 1000)
+            return False
+        self.transition.start()
+        return True
+
+    def will_unmount(self):
+        """ページから外された時（セッションの終了・期限切れ）に遷移を停止する"""
+        self.transition.stop()
+        if self.on_unmount:
+            self.on_unmount()
+
+    @property
+    def is_focus_mode(self) -> bool:
+        """集中モードが有効かどうか"""
+        return self.transition.is_running
@@ -49,6 +49,59 @@ class ProgressRing(ft.Container):
         """
         self.height = int(self.width * progress)
 
+    def start_countdown(self, remaining_seconds: float):
+        """
+        クライアント側でのカウントダウンアニメーションを開始
+        現在の高さから0までを、残り時間と同じ長さで線形にアニメーションさせる
+        Args:
+            remaining_seconds (float): 完了までの残り秒数
+        """
+        self.animate = ft.animation.Animation(
+            duration=int(max(0.0, remaining_seconds) * 1000),
+            curve="linear"
+        )
+        self.height = 0
+
+    def sync(self, progress: float) -> bool:
+        """
+        アニメーションせずに指定した進行度の位置へ移動する
+        Args:
+            progress (float): 0.0から1.0の間の進行度
+        Returns:
+            bool: 高さが変化した場合True（クライアントへの送信が必要）
+        """
+        height = int(self.width * progress)
+        if self.height == height:
+            return False
+        self.animate = None
+        self.height = height
+        return True
+
+    def freeze(self, progress: float):
+        """
+        アニメーションを止め、指定した進行度の位置に同期する
+        Args:
+            progress (float): 0.0から1.0の間の進行度
+        """
+        self.animate = ft.animation.Animation(
+            duration=300,
+            curve="easeInOut"
+        )
+        self.update_progress(progress)
+
+    def set_colors(self, start_color: str, end_color: str):
+        """
+        グラデーションの色を変更
+        Args:
+            start_color (str): グラデーション開始色
+            end_color (str): グラデーション終了色
+        """
+        self.gradient.colors = [start_color, end_color]
+
     def reset(self):
         """プログレスリングをリセット"""
+        self.animate = ft.animation.Animation(
+            duration=300,
+            curve="easeInOut"
+        )
         self.height = self.width
\ No newline at end of file
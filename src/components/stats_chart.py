@@ -0,0 +1,156 @@
+import flet as ft
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from ..utils.database import Database, ROLLUP_FORMATS, rollup_bounds
+from ..utils.downsample import Point, lttb, minmax
+
+class StatsChart(ft.Container):
+    """集中時間の推移を表示するグラフ（画面解像度に合わせて間引いて描画）"""
+
+    # キャッシュする系列の最大数
+    CACHE_SIZE = 16
+
+    def __init__(
+        self,
+        database: Database,
+        max_points: int = 300,
+        method: str = "lttb",
+        line_color: str = "#4ECDC4",
+        user_id: Optional[str] = None
+    ):
+        """
+        統計グラフの初期化
+        Args:
+            database (Database): 集計元のデータベース
+            max_points (int): 描画する最大点数（グラフの横幅ピクセル数が目安）
+            method (str): 間引き方法（"lttb"または"minmax"）
+            line_color (str): 線の色
+            user_id (str): 指定した場合はそのユーザーのみ集計
+        """
+        super().__init__()
+
+        self.database = database
+        self.max_points = max_points
+        self.method = method
+        self.user_id = user_id
+        self._cache: "OrderedDict[Tuple, List[Point]]" = OrderedDict()
+        self.since: Optional[datetime] = None
+        self.until: Optional[datetime] = None
+
+        # グラフの設定
+        self.series = ft.LineChartData(
+            data_points=[],
+            color=line_color,
+            stroke_width=2,
+            curved=True,
+        )
+        self.chart = ft.LineChart(
+            data_series=[self.series],
+            min_y=0,
+            expand=True,
+        )
+        self.content = self.chart
+        self.expand = True
+
+    def show(
+        self,
+        since: datetime,
+        until: datetime,
+        granularity: Optional[str] = None
+    ):
+        """
+        指定した期間のグラフを表示する
+        Args:
+            since (datetime): 表示開始時刻
+            until (datetime): 表示終了時刻
+            granularity (str): 集計単位（Noneの場合は期間から自動選択）
+        """
+        self.since, self.until = since, until
+        granularity = granularity or self._choose_granularity(until - since)
+        points = self._get_series(since, until, granularity)
+
+        self.series.data_points = [
+            ft.LineChartDataPoint(x, y) for x, y in points
+        ]
+        self.chart.min_x = since.timestamp()
+        self.chart.max_x = until.timestamp()
+
+    def zoom(self, center: datetime, factor: float):
+        """
+        表示中の期間を拡大・縮小する
+        期間が狭くなると、より細かい集計単位のデータを取得する
+        Args:
+            center (datetime): 拡大・縮小の中心となる時刻
+            factor (float): 期間の倍率（1未満で拡大）
+        """
+        if self.since is None or self.until is None:
+            return
+        half = (self.until - self.since) * factor / 2
+        self.show(center - half, center + half)
+
+    def invalidate(self):
+        """キャッシュを破棄する（新しいセッションが記録された場合など）"""
+        self._cache.clear()
+
+    @staticmethod
+    def _choose_granularity(span: timedelta) -> str:
+        """表示期間の長さから集計単位を選ぶ"""
+        if span <= timedelta(days=7):
+            return "hour"
+        if span <= timedelta(days=366):
+            return "day"
+        return "month"
+
+    def _get_series(
+        self,
+        since: datetime,
+        until: datetime,
+        granularity: str
+    ) -> List[Point]:
+        """
+        間引き済みの系列を取得する（期間と集計単位ごとにキャッシュ）
+        Returns:
+            (UNIX時刻, 集中時間[分])のリスト
+        """
+        # 集計単位の境界に揃え、わずかにずれた範囲（ズームの中心など）でもキャッシュを使う
+        since, until = rollup_bounds(since, until, granularity)
+        key = (since, until, granularity, self.max_points, self.method)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        points = self._load_series(since, until, granularity)
+        if self.method == "minmax":
+            points = minmax(points, self.max_points // 2)
+        else:
+            points = lttb(points, self.max_points)
+
+        self._cache[key] = points
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return points
+
+    def _load_series(
+        self,
+        since: datetime,
+        until: datetime,
+        granularity: str
+    ) -> List[Point]:
+        """データベースの集計結果を期間ごとの合計に変換する"""
+        period_format = ROLLUP_FORMATS[granularity]
+        totals: Dict[str, int] = {}
+        for rows in self.database.iter_rollups(
+            granularity, user_id=self.user_id, since=since, until=until
+        ):
+            for period, _user_id, _sessions, focus_seconds in rows:
+                totals[period] = totals.get(period, 0) + focus_seconds
+
+        return [
+            (
+                datetime.strptime(period, period_format).timestamp(),
+                seconds / 60,
+            )
+            for period, seconds in totals.items()
+        ]
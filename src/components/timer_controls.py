@@ -1,5 +1,5 @@
 import flet as ft
-from typing import Callable
+from typing import Callable, Optional
 
 class TimerControls(ft.Container):
     """タイマーのコントロール部分（入力フィールドとボタン）"""
@@ -8,7 +8,10 @@ class TimerControls(ft.Container):
         self,
         on_start: Callable,
         on_reset: Callable,
-        initial_minutes: str = "25"
+        initial_minutes: str = "25",
+        on_focus_toggle: Optional[Callable] = None,
+        icon_size: int = 32,
+        unit_font_size: int = 16
     ):
         """
         タイマーコントロールの初期化
@@ -16,6 +19,9 @@ class TimerControls(ft.Container):
             on_start (Callable): 開始/一時停止ボタンのコールバック
             on_reset (Callable): リセットボタンのコールバック
             initial_minutes (str): 初期設定時間（分）
+            on_focus_toggle (Callable): 集中モード切り替えボタンのコールバック
+            icon_size (int): ボタンのアイコンサイズ
+            unit_font_size (int): 単位（分）のフォントサイズ
         """
         super().__init__()
         
@@ -31,7 +37,7 @@ class TimerControls(ft.Container):
         self.start_button = ft.IconButton(
             icon=ft.icons.PLAY_ARROW,
             icon_color=ft.colors.ON_SURFACE,
-            icon_size=32,
+            icon_size=icon_size,
             on_click=on_start,
         )
         
@@ -39,17 +45,30 @@ class TimerControls(ft.Container):
         self.reset_button = ft.IconButton(
             icon=ft.icons.REFRESH,
             icon_color=ft.colors.ON_SURFACE,
-            icon_size=32,
+            icon_size=icon_size,
             on_click=on_reset,
         )
         
+        # 集中モード切り替えボタン
+        self.focus_button = ft.IconButton(
+            icon=ft.icons.DARK_MODE_OUTLINED,
+            icon_color=ft.colors.ON_SURFACE,
+            icon_size=icon_size,
+            on_click=on_focus_toggle,
+            visible=on_focus_toggle is not None,
+        )
+        
+        # 単位の表示
+        self.unit_text = ft.Text("分", size=unit_font_size)
+        
         # レイアウトの構築
         self.content = ft.Row(
             controls=[
                 self.time_input,
-                ft.Text("分", size=16),
+                self.unit_text,
                 self.start_button,
-                self.reset_button
+                self.reset_button,
+                self.focus_button
             ],
             alignment=ft.MainAxisAlignment.CENTER,
             spacing=20,
@@ -79,6 +98,27 @@ class TimerControls(ft.Container):
             ft.icons.PAUSE if is_running else ft.icons.PLAY_ARROW
         )
     
+    def update_focus_button(self, is_focus_mode: bool):
+        """
+        集中モード切り替えボタンの状態を更新
+        Args:
+            is_focus_mode (bool): 集中モードが有効かどうか
+        """
+        self.focus_button.icon = (
+            ft.icons.DARK_MODE if is_focus_mode else ft.icons.DARK_MODE_OUTLINED
+        )
+    
+    def set_sizes(self, icon_size: int, unit_font_size: int):
+        """
+        アイコンと文字のサイズを変更
+        Args:
+            icon_size (int): ボタンのアイコンサイズ
+            unit_font_size (int): 単位（分）のフォントサイズ
+        """
+        for button in (self.start_button, self.reset_button, self.focus_button):
+            button.icon_size = icon_size
+        self.unit_text.size = unit_font_size
+    
     def disable_controls(self, disabled: bool = True):
         """
         コントロールの有効/無効を切り替え
@@ -3,13 +3,17 @@ import flet as ft
 class TimerDisplay(ft.Container):
     """タイマーの時間表示コンポーネント"""
     
-    def __init__(self):
-        """タイマー表示の初期化"""
+    def __init__(self, font_size: int = 48):
+        """
+        タイマー表示の初期化
+        Args:
+            font_size (int): 時間表示のフォントサイズ
+        """
         super().__init__()
         
         self.time_text = ft.Text(
             value="00:00",
-            size=48,
+            size=font_size,
             weight=ft.FontWeight.BOLD,
             color=ft.colors.ON_SURFACE,
         )
@@ -18,14 +22,28 @@ class TimerDisplay(ft.Container):
         self.content = self.time_text
         self.alignment = ft.alignment.center
         
-    def update_time(self, minutes: int, seconds: int):
+    def update_time(self, minutes: int, seconds: int) -> bool:
         """
         表示時間の更新
         Args:
             minutes (int): 分
             seconds (int): 秒
+        Returns:
+            bool: 表示内容が変化した場合True
+        """
+        value = f"{minutes:02d}:{seconds:02d}"
+        if self.time_text.value == value:
+            return False
+        self.time_text.value = value
+        return True
+
+    def set_font_size(self, font_size: int):
+        """
+        フォントサイズの変更
+        Args:
+            font_size (int): 時間表示のフォントサイズ
         """
-        self.time_text.value = f"{minutes:02d}:{seconds:02d}"
+        self.time_text.size = font_size
 
     def reset(self):
         """表示をリセット"""
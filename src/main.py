@@ -1,6 +1,27 @@
 import flet as ft
 import logging
-from timer.timer_app import TimerApp
+import os
+import threading
+from typing import NamedTuple, Optional
+from .timer.timer_app import TimerApp
+from .utils.constants import (
+    BALANCER_ENV_VAR,
+    DATABASE_PATH,
+    NGINX_CONFIG_PATH,
+    PROFILE_POLL_INTERVAL,
+    PROFILE_SESSIONS_PATH,
+    SERVER_HOST,
+    SERVER_PORT,
+    THEME_CONFIG_PATH,
+    THEME_POLL_INTERVAL,
+    WORKER_BASE_PORT,
+    WORKERS_ENV_VAR,
+)
+from .utils.database import Database
+from .utils.notification import BannerSink, NotificationDispatcher
+from .utils.profiling import ProfileControl
+from .utils.sharding import serve_sharded
+from .utils.theme_config import ThemeWatcher
 
 # ロギングの設定
 logging.basicConfig(
@@ -9,6 +30,47 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class Services(NamedTuple):
+    """全セッションで共有するサービス"""
+    database: Database                  # セッション履歴の保存先
+    notifier: NotificationDispatcher    # 完了通知のディスパッチャ
+    banner_sink: BannerSink             # ページ内バナーの配信先
+    theme_watcher: ThemeWatcher         # テーマ設定の監視
+    profile_control: ProfileControl     # 計測対象の管理（記載したセッションのみ計測する）
+
+
+_services: Optional[Services] = None
+_services_lock = threading.Lock()
+
+def start_services() -> Services:
+    """
+    全セッションで共有するサービスを作成して開始する（2回目以降は作成済みのものを返す）
+    ページを配信するプロセスでのみ呼び出す。振り分けだけを行う親プロセス
+    （serve_sharded）では、データベースや監視スレッドを作成しない
+    Returns:
+        共有サービス
+    """
+    global _services
+    with _services_lock:
+        if _services is None:
+            banner_sink = BannerSink()
+            notifier = NotificationDispatcher([banner_sink])
+            theme_watcher = ThemeWatcher(THEME_CONFIG_PATH, THEME_POLL_INTERVAL)
+            profile_control = ProfileControl(
+                PROFILE_SESSIONS_PATH, PROFILE_POLL_INTERVAL
+            )
+            _services = Services(
+                Database(DATABASE_PATH),
+                notifier,
+                banner_sink,
+                theme_watcher,
+                profile_control,
+            )
+            notifier.start()
+            theme_watcher.start()
+            profile_control.start()
+        return _services
+
 def main(page: ft.Page):
     """
     アプリケーションのメインエントリーポイント
@@ -17,8 +79,17 @@ def main(page: ft.Page):
     """
     try:
         # アプリケーションの作成
-        app = TimerApp.create(page)
-        logger.info("アプリケーションが正常に起動しました")
+        services = start_services()
+        app = TimerApp.create(
+            page,
+            services.database,
+            services.notifier,
+            services.banner_sink,
+            services.theme_watcher,
+            services.profile_control,
+        )
+        # 計測対象の指定に使えるよう、セッションIDを記録する
+        logger.info(f"アプリケーションが正常に起動しました（セッション: {page.session_id}）")
         
     except Exception as e:
         # エラーハンドリング
@@ -42,8 +113,31 @@ def main(page: ft.Page):
             )
         )
 
+def run_worker(port: int):
+    """
+    ワーカープロセスとしてWebサーバーを起動する
+    Args:
+        port: 待ち受けるポート
+    """
+    start_services()
+    ft.app(target=main, view=None, port=port)
+
 if __name__ == "__main__":
     try:
-        ft.app(target=main)
+        workers = os.environ.get(WORKERS_ENV_VAR)
+        if workers is not None:
+            # 複数のワーカープロセスにセッションを分散して配信
+            serve_sharded(
+                run_worker,
+                int(workers),
+                SERVER_HOST,
+                SERVER_PORT,
+                WORKER_BASE_PORT,
+                balancer=os.environ.get(BALANCER_ENV_VAR, "proxy"),
+                config_path=NGINX_CONFIG_PATH,
+            )
+        else:
+            start_services()
+            ft.app(target=main)
     except Exception as e:
         logger.critical(f"アプリケーションが予期せぬエラーで終了しました: {str(e)}")
\ No newline at end of file
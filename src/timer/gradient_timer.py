@@ -1,40 +1,70 @@
 import flet as ft
-from typing import Optional
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
 
 from ..components.progress_ring import ProgressRing
 from ..components.timer_display import TimerDisplay
 from ..components.timer_controls import TimerControls
 from ..utils.timer_logic import TimerLogic
+from ..utils.profiling import SessionProfiler
+from ..utils.theme_config import DEFAULT_THEME
 from ..utils.constants import *
 
 class GradientTimer(ft.UserControl):
     """グラデーションエフェクトを使用したビジュアルタイマー"""
     
-    def __init__(self):
-        """タイマーコンポーネントの初期化"""
+    def __init__(
+        self,
+        on_focus_toggle: Optional[Callable[[], bool]] = None,
+        on_session_complete: Optional[Callable[[datetime, int], None]] = None,
+        profiler: Optional[SessionProfiler] = None,
+        theme: Optional[Dict[str, Any]] = None
+    ):
+        """
+        タイマーコンポーネントの初期化
+        Args:
+            on_focus_toggle: 集中モード切り替え時に呼び出されるコールバック。
+                切り替え後に集中モードが有効かどうかを返す
+            on_session_complete: セッション完了時に呼び出されるコールバック。
+                開始時刻と合計秒数が渡される
+            profiler: タイマースレッドとコールバックを計測するプロファイラ
+            theme: テーマ設定（Noneの場合は既定値）
+        """
         super().__init__()
+        self.theme = dict(theme or DEFAULT_THEME)
+        self._is_complete = False
+        self.on_focus_toggle = on_focus_toggle
+        self.on_session_complete = on_session_complete
+        self._session_started_at: Optional[datetime] = None
         
         # UIコンポーネントの初期化
         self.progress_ring = ProgressRing(
             width=RING_SIZE,
             height=RING_SIZE,
-            start_color=GRADIENT_START_COLOR,
-            end_color=GRADIENT_END_COLOR
+            start_color=self.theme["gradient_start_color"],
+            end_color=self.theme["gradient_end_color"]
         )
         
-        self.timer_display = TimerDisplay()
+        self.timer_display = TimerDisplay(
+            font_size=self.theme["timer_font_size"]
+        )
         
         # タイマーロジックの初期化
         self.timer_logic = TimerLogic(
             on_tick=self._on_timer_tick,
-            on_complete=self._on_timer_complete
+            on_complete=self._on_timer_complete,
+            profiler=profiler,
+            update_interval=self.theme["update_interval"]
         )
         
         # コントロールの初期化
         self.timer_controls = TimerControls(
             on_start=self._on_start_click,
             on_reset=self._on_reset_click,
-            initial_minutes=DEFAULT_MINUTES
+            initial_minutes=DEFAULT_MINUTES,
+            on_focus_toggle=self._on_focus_click if on_focus_toggle else None,
+            icon_size=self.theme["icon_size"],
+            unit_font_size=self.theme["unit_font_size"]
         )
 
     def build(self):
@@ -68,10 +98,20 @@ class GradientTimer(ft.UserControl):
         Args:
             remaining_seconds: 残り秒数
         """
+        if self.timer_logic.profiler is not None:
+            self.timer_logic.profiler.record_tick()
+        
         # 時間表示の更新
         minutes = remaining_seconds // 60
         seconds = remaining_seconds % 60
-        self.timer_display.update_time(minutes, seconds)
+        changed = self.timer_display.update_time(minutes, seconds)
+        
+        if CLIENT_SIDE_ANIMATION:
+            # リングはクライアント側でアニメーションしているため、
+            # 表示が変化した時のみ時間表示だけを送信する
+            if changed:
+                self.timer_display.update()
+            return
         
         # プログレスリングの更新
         progress = self.timer_logic.progress
@@ -84,8 +124,21 @@ class GradientTimer(ft.UserControl):
         """タイマー完了時の処理"""
         # UIの更新
         self.timer_controls.update_start_button(False)
-        self.progress_ring.gradient.colors = [COMPLETE_COLOR, COMPLETE_COLOR]
+        self._is_complete = True
+        complete_color = self.theme["complete_color"]
+        self.progress_ring.set_colors(complete_color, complete_color)
+        if CLIENT_SIDE_ANIMATION:
+            # クライアント側アニメーションの終端に同期
+            self.progress_ring.freeze(0.0)
         self.update()
+        
+        # セッションの記録
+        if self.on_session_complete and self._session_started_at:
+            self.on_session_complete(
+                self._session_started_at,
+                self.timer_logic.total_seconds
+            )
+        self._session_started_at = None
 
     def _on_start_click(self, e):
         """開始/一時停止ボタンのクリックハンドラ"""
@@ -94,22 +147,86 @@ class GradientTimer(ft.UserControl):
             minutes = self.timer_controls.get_input_minutes()
             if minutes > 0 and self.timer_logic.start(minutes):
                 self.timer_controls.update_start_button(True)
+                if self._session_started_at is None:
+                    self._session_started_at = datetime.now()
                 # プログレスリングの色をリセット
-                self.progress_ring.gradient.colors = [
-                    GRADIENT_START_COLOR,
-                    GRADIENT_END_COLOR
-                ]
+                self._is_complete = False
+                self.progress_ring.set_colors(
+                    self.theme["gradient_start_color"],
+                    self.theme["gradient_end_color"]
+                )
+                if CLIENT_SIDE_ANIMATION:
+                    # 完了後の再開始などでリングが現在の進行度とずれている場合は、
+                    # アニメーションの開始位置を先に送信しておく
+                    if self.progress_ring.sync(self.timer_logic.progress):
+                        self.update()
+                    # 完了予定時刻までの時間をかけてクライアント側でリングを縮める
+                    self.progress_ring.start_countdown(
+                        (self.timer_logic.deadline - datetime.now()).total_seconds()
+                    )
         else:
             # タイマーの一時停止
             self.timer_logic.pause()
             self.timer_controls.update_start_button(False)
+            if CLIENT_SIDE_ANIMATION:
+                # クライアント側アニメーションを現在の進行度で止める
+                self.progress_ring.freeze(self.timer_logic.progress)
         
         self.update()
 
     def _on_reset_click(self, e):
         """リセットボタンのクリックハンドラ"""
         self.timer_logic.reset()
+        self._session_started_at = None
         self.timer_display.reset()
         self.progress_ring.reset()
         self.timer_controls.update_start_button(False)
-        self.update()
\ No newline at end of file
+        self.update()
+
+    def apply_theme(self, changes: Dict[str, Any]):
+        """
+        変更されたテーマ設定だけを各コントロールに反映する
+        コントロールツリーは作り直さず、実行中のタイマーもそのまま継続する
+        Args:
+            changes: 変更された項目と新しい値の辞書
+        """
+        self.theme.update(changes)
+
+        if changes.keys() & {
+            "gradient_start_color", "gradient_end_color", "complete_color"
+        }:
+            if self._is_complete:
+                complete_color = self.theme["complete_color"]
+                self.progress_ring.set_colors(complete_color, complete_color)
+            else:
+                self.progress_ring.set_colors(
+                    self.theme["gradient_start_color"],
+                    self.theme["gradient_end_color"]
+                )
+        if "timer_font_size" in changes:
+            self.timer_display.set_font_size(self.theme["timer_font_size"])
+        if changes.keys() & {"icon_size", "unit_font_size"}:
+            self.timer_controls.set_sizes(
+                self.theme["icon_size"],
+                self.theme["unit_font_size"]
+            )
+        if "update_interval" in changes:
+            self.timer_logic.update_interval = self.theme["update_interval"]
+
+        # 表示中の場合のみ、変更をまとめて1回で送信する
+        if self.page is not None:
+            self.update()
+
+    def set_profiler(self, profiler: Optional[SessionProfiler]):
+        """
+        プロファイラを設定する（次回のタイマー開始時から有効）
+        Args:
+            profiler: 使用するプロファイラ（Noneの場合は計測を無効化）
+        """
+        self.timer_logic.profiler = profiler
+
+    def _on_focus_click(self, e):
+        """集中モード切り替えボタンのクリックハンドラ"""
+        is_focus_mode = self.on_focus_toggle()
+        self.timer_controls.update_focus_button(is_focus_mode)
+        self.timer_controls.update()
\ No newline at end of file
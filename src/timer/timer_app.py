@@ -1,19 +1,51 @@
 import flet as ft
+from datetime import datetime
+from typing import List, Optional
 from .gradient_timer import GradientTimer
+from ..components.focus_background import FocusBackground
+from ..utils.database import Database
+from ..utils.notification import BannerSink, Notification, NotificationDispatcher
+from ..utils.profiling import ProfileControl, SessionProfiler
+from ..utils.theme_config import ThemeWatcher
 from ..utils.constants import *
 
 class TimerApp:
     """タイマーアプリケーションのメインクラス"""
     
-    def __init__(self, page: ft.Page):
+    def __init__(
+        self,
+        page: ft.Page,
+        database: Optional[Database] = None,
+        notifier: Optional[NotificationDispatcher] = None,
+        banner_sink: Optional[BannerSink] = None,
+        theme_watcher: Optional[ThemeWatcher] = None,
+        profile_control: Optional[ProfileControl] = None
+    ):
         """
         アプリケーションの初期化
         Args:
             page: Fletページオブジェクト
+            database: セッション履歴の保存先（Noneの場合は記録しない）
+            notifier: 完了通知のディスパッチャ（Noneの場合は通知しない）
+            banner_sink: ページ内バナーの配信先（このページを登録する）
+            theme_watcher: テーマ設定の監視（タイマーを登録して変更を反映する）
+            profile_control: 計測対象の管理（このセッションを登録する）
         """
         self.page = page
+        self.database = database
+        self.notifier = notifier
+        self.theme_watcher = theme_watcher
+        self.profile_control = profile_control
+        self.banner_sink = banner_sink
+        if banner_sink is not None:
+            # 一時的な切断では解除しない（再接続時にmain()は再実行されないため）
+            banner_sink.register(page.session_id, self._show_banner)
         self._configure_page()
         self._init_ui()
+        page.on_close = self._on_close
+        if profile_control is not None:
+            # 管理者がこのセッションIDを指定すると計測が有効になる
+            profile_control.register(page.session_id, self)
 
     def _configure_page(self):
         """ページの基本設定を行う"""
@@ -30,24 +62,119 @@ class TimerApp:
     def _init_ui(self):
         """UIコンポーネントの初期化と配置"""
         # タイマーインスタンスの作成
-        timer = GradientTimer()
+        self.timer = timer = GradientTimer(
+            on_focus_toggle=self._toggle_focus_mode,
+            on_session_complete=self._on_session_complete,
+            theme=self.theme_watcher.current if self.theme_watcher else None,
+        )
+        if self.theme_watcher:
+            self.theme_watcher.register(timer)
+        
+        # 集中モード用の背景
+        self.background = FocusBackground(
+            content=timer,
+            base_color=FOCUS_BASE_COLOR,
+            palette=FOCUS_PALETTE,
+            segment_seconds=FOCUS_SEGMENT_DURATION,
+            max_fps=FOCUS_MAX_FPS,
+            client_animation=FOCUS_CLIENT_ANIMATION,
+            on_unmount=self._release,
+        )
         
         # ページにタイマーを追加
-        self.page.add(
-            ft.Container(
-                content=timer,
-                alignment=ft.alignment.center,
-                expand=True,
+        self.page.add(self.background)
+
+    def _on_close(self, e):
+        """セッション終了時の処理"""
+        self._release()
+
+    def _release(self):
+        """
+        閉じたページを更新し続けないよう、遷移を停止して登録を解除する
+        ページを閉じた時と、セッションの期限切れでコントロールが外された時に呼び出される
+        """
+        self.background.transition.stop()
+        if self.banner_sink is not None:
+            self.banner_sink.unregister(self.page.session_id)
+        if self.profile_control is not None:
+            self.profile_control.unregister(self.page.session_id)
+
+    def _toggle_focus_mode(self) -> bool:
+        """
+        集中モードを切り替える
+        Returns:
+            切り替え後に集中モードが有効な場合True
+        """
+        return self.background.toggle()
+
+    def set_profiling(self, enabled: bool):
+        """
+        このセッションのプロファイリングを切り替える（ProfileControlから呼び出される）
+        計測はタイマーの次回開始時から有効になり、停止するたびに結果を出力する
+        Args:
+            enabled: 計測を有効にする場合True
+        """
+        self.timer.set_profiler(
+            SessionProfiler(self.page.session_id, PROFILE_OUTPUT_DIR)
+            if enabled else None
+        )
+
+    def _on_session_complete(self, started_at: datetime, duration_seconds: int):
+        """
+        完了したセッションを記録し、完了通知をキューに追加する
+        Args:
+            started_at: セッションの開始時刻
+            duration_seconds: セッションの合計秒数
+        """
+        if self.database:
+            # 書き込みは別スレッドで行い、タイマースレッドをブロックしない
+            self.database.enqueue_session(
+                user_id=self.page.session_id,
+                started_at=started_at,
+                ended_at=datetime.now(),
+                duration_seconds=duration_seconds,
+            )
+        if self.notifier:
+            # 配信は別スレッドで行われるため、タイマースレッドはブロックされない
+            self.notifier.notify(
+                user_id=self.page.session_id,
+                title="タイマー完了",
+                message=f"{duration_seconds // 60}分のセッションが完了しました",
+                # 同じユーザーへの完了通知は重複除去の期間内で1件にまとめる
+                key="timer_complete",
             )
+
+    def _show_banner(self, notifications: List[Notification]):
+        """
+        通知をページ内のバナーとして表示する
+        Args:
+            notifications: このページ宛ての通知のリスト
+        """
+        self.page.open(
+            ft.SnackBar(ft.Text("\n".join(n.message for n in notifications)))
         )
 
     @staticmethod
-    def create(page: ft.Page) -> 'TimerApp':
+    def create(
+        page: ft.Page,
+        database: Optional[Database] = None,
+        notifier: Optional[NotificationDispatcher] = None,
+        banner_sink: Optional[BannerSink] = None,
+        theme_watcher: Optional[ThemeWatcher] = None,
+        profile_control: Optional[ProfileControl] = None
+    ) -> 'TimerApp':
         """
         アプリケーションのファクトリメソッド
         Args:
             page: Fletページオブジェクト
+            database: セッション履歴の保存先
+            notifier: 完了通知のディスパッチャ
+            banner_sink: ページ内バナーの配信先
+            theme_watcher: テーマ設定の監視
+            profile_control: 計測対象の管理
         Returns:
             TimerAppインスタンス
         """
-        return TimerApp(page)
\ No newline at end of file
+        return TimerApp(
+            page, database, notifier, banner_sink, theme_watcher, profile_control
+        )
\ No newline at end of file
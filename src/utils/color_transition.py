@@ -0,0 +1,176 @@
+"""背景色のスムーズな遷移を行うためのトランジションエンジン"""
+from functools import lru_cache
+from itertools import cycle
+import threading
+import time
+from typing import Callable, Optional, Sequence, Tuple
+
+
+def hex_to_rgb(color: str) -> Tuple[int, int, int]:
+    """
+    16進カラーコードをRGBのタプルに変換する
+    Args:
+        color: "#RRGGBB"形式のカラーコード
+    Returns:
+        (r, g, b)のタプル
+    """
+    value = color.lstrip("#")
+    if len(value) != 6:
+        raise ValueError(f"不正なカラーコードです: {color}")
+    return tuple(int(value[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def rgb_to_hex(rgb: Sequence[int]) -> str:
+    """
+    RGBのタプルを16進カラーコードに変換する
+    Args:
+        rgb: (r, g, b)のタプル
+    Returns:
+        "#RRGGBB"形式のカラーコード
+    """
+    return "#{:02X}{:02X}{:02X}".format(*rgb)
+
+
+def ease_in_out(t: float) -> float:
+    """
+    easeInOut（三次）のイージング関数
+    Args:
+        t: 0.0から1.0の間の進行度
+    Returns:
+        イージング適用後の進行度
+    """
+    if t < 0.5:
+        return 4 * t * t * t
+    return 1 - (-2 * t + 2) ** 3 / 2
+
+
+@lru_cache(maxsize=32)
+def build_keyframes(
+    palette: Tuple[str, ...],
+    segment_ms: int,
+    fps: int
+) -> Tuple[str, ...]:
+    """
+    パレットの各色の間をイージング補間したキーフレーム表を作成する
+    パレットと時間ごとにキャッシュされるため、同じ設定では再計算しない
+    Args:
+        palette: 遷移させる色のタプル（最後の色から最初の色へも補間する）
+        segment_ms: 1色あたりの遷移時間（ミリ秒）
+        fps: 1秒あたりのフレーム数
+    Returns:
+        各フレームのカラーコードのタプル
+    """
+    if not palette:
+        return ()
+    steps = max(1, segment_ms * fps // 1000)
+    rgbs = [hex_to_rgb(c) for c in palette]
+    frames = []
+    for i, start in enumerate(rgbs):
+        end = rgbs[(i + 1) % len(rgbs)]
+        for step in range(steps):
+            t = ease_in_out(step / steps)
+            frames.append(rgb_to_hex(
+                round(s + (e - s) * t) for s, e in zip(start, end)
+            ))
+    return tuple(frames)
+
+
+class ColorTransition:
+    """
+    背景色の遷移をスケジューリングするクラス
+    クライアント側アニメーションが使える場合は1色ごとに1回だけ、
+    使えない場合は事前計算したキーフレームをフレーム予算内で適用する
+    """
+
+    def __init__(
+        self,
+        apply: Callable[[str, int], None],
+        palette: Sequence[str],
+        segment_seconds: float,
+        max_fps: int = 10,
+        client_animation: bool = True
+    ):
+        """
+        トランジションの初期化
+        Args:
+            apply: 色を適用するコールバック。色とアニメーション時間（ミリ秒）が渡される
+            palette: 遷移させる色のリスト
+            segment_seconds: 1色あたりの遷移時間（秒）
+            max_fps: サーバー側で補間する場合の最大フレームレート
+            client_animation: クライアント側アニメーションに任せる場合True
+        """
+        self.apply = apply
+        self.palette = tuple(palette)
+        self.segment_ms = int(segment_seconds * 1000)
+        self.max_fps = max(1, max_fps)
+        self.client_animation = client_animation
+
+        # 実行ごとに新しい停止イベントを作成し、スレッドに渡す
+        # （停止直後に再開しても、前回のスレッドは自分のイベントで終了する）
+        self._stop_event = threading.Event()
+        self._apply_lock = threading.RLock()  # 停止後に色が適用されないようにする
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """トランジションを開始する"""
+        if self.is_running or not self.palette:
+            return
+        self._stop_event = threading.Event()
+        target = (
+            self._run_client_side if self.client_animation
+            else self._run_keyframes
+        )
+        self._thread = threading.Thread(
+            target=target, args=(self._stop_event,), daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """
+        トランジションを停止する
+        適用中の色の更新が終わるまで待つため、戻った後に色が変更されることはない
+        """
+        with self._apply_lock:
+            self._stop_event.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(0.1)
+        self._thread = None
+
+    def _apply(self, stop_event: threading.Event, color: str, duration_ms: int) -> bool:
+        """
+        停止されていなければ色を適用する
+        Returns:
+            bool: 適用した場合True
+        """
+        with self._apply_lock:
+            if stop_event.is_set():
+                return False
+            self.apply(color, duration_ms)
+            return True
+
+    def _run_client_side(self, stop_event: threading.Event):
+        """1色につき1回だけ更新し、補間はクライアント側に任せる"""
+        for color in cycle(self.palette):
+            if not self._apply(stop_event, color, self.segment_ms):
+                break
+            if stop_event.wait(self.segment_ms / 1000):
+                break
+
+    def _run_keyframes(self, stop_event: threading.Event):
+        """事前計算したキーフレームをフレーム予算内で順に適用する"""
+        frames = build_keyframes(self.palette, self.segment_ms, self.max_fps)
+        interval = 1 / self.max_fps
+        started = time.monotonic()
+        index = 0
+        while self._apply(stop_event, frames[index % len(frames)], 0):
+            # 処理が遅れた場合はフレームを飛ばして時間どおりに進める
+            elapsed = time.monotonic() - started
+            index = int(elapsed / interval) + 1
+            delay = index * interval - elapsed
+            if stop_event.wait(delay):
+                break
+
+    @property
+    def is_running(self) -> bool:
+        """トランジションが実行中かどうか"""
+        return self._thread is not None and self._thread.is_alive()
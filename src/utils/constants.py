@@ -15,6 +15,18 @@ GRADIENT_START_COLOR = "#FF6B6B"  # 開始時の色（赤系）
 GRADIENT_END_COLOR = "#4ECDC4"    # 終了時の色（青緑系）
 COMPLETE_COLOR = "#4ECDC4"        # 完了時の色
 
+# 集中モード設定
+FOCUS_BASE_COLOR = "#0D0D0D"      # 通常時の背景色
+FOCUS_PALETTE = (                 # 集中モード時に遷移する背景色
+    "#1A1A2E",
+    "#16213E",
+    "#0F3460",
+    "#1B262C",
+)
+FOCUS_SEGMENT_DURATION = 30       # 1色あたりの遷移時間（秒）
+FOCUS_MAX_FPS = 10                # サーバー側で補間する場合の最大フレームレート
+FOCUS_CLIENT_ANIMATION = True     # 色の補間をクライアント側に任せる
+
 # フォント設定
 TIMER_FONT_SIZE = 48
 UNIT_FONT_SIZE = 16
@@ -22,6 +34,33 @@ UNIT_FONT_SIZE = 16
 # アニメーション設定
 ANIMATION_CURVE = "easeInOut"
 UPDATE_INTERVAL = 0.1  # seconds
+MIN_UPDATE_INTERVAL = 0.05  # テーマ設定で指定できる最小の更新間隔（秒）
+
+# クライアント側アニメーション設定
+# Trueの場合、リングの進行はクライアント側のアニメーションに任せ、
+# サーバーからは開始・一時停止・リセット・完了時のみ同期する
+CLIENT_SIDE_ANIMATION = True
+
+# データベース設定
+DATABASE_PATH = "timer_history.db"
+EXPORT_CHUNK_SIZE = 1000  # エクスポートや集計で履歴を1回に読み出す行数
+
+# プロファイリング設定
+PROFILE_SESSIONS_PATH = "profile_sessions.txt"  # 計測するセッションID（1行に1つ）
+PROFILE_POLL_INTERVAL = 1.0  # 計測対象の変更を確認する間隔（秒）
+PROFILE_OUTPUT_DIR = "profiles"  # 計測結果の出力先
+
+# サーバー設定（ワーカープロセスでの分散配信）
+WORKERS_ENV_VAR = "TIMER_WORKERS"  # ワーカー数（未設定の場合は単一プロセス）
+SERVER_HOST = "0.0.0.0"
+SERVER_PORT = 8550
+WORKER_BASE_PORT = 8600            # ワーカーはこのポートから連番で待ち受ける
+BALANCER_ENV_VAR = "TIMER_BALANCER"  # "nginx"で外部のロードバランサーを使用
+NGINX_CONFIG_PATH = "nginx.conf"    # nginx用の設定ファイルの出力先
+
+# テーマ設定ファイル（実行中の変更が自動的に反映される）
+THEME_CONFIG_PATH = "theme.json"
+THEME_POLL_INTERVAL = 1.0  # 更新を確認する間隔（秒）
 
 # コントロール設定
 DEFAULT_MINUTES = "25"
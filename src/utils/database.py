@@ -0,0 +1,310 @@
+"""セッション履歴とタスクを保存するデータベース操作"""
+from contextlib import closing
+from datetime import datetime, timedelta
+import logging
+import queue
+import sqlite3
+import threading
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from .constants import EXPORT_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+# テーブルの列定義（エクスポート時のヘッダーとしても使用する）
+TASK_COLUMNS = ("id", "title", "category", "created_at")
+SESSION_COLUMNS = (
+    "id",
+    "user_id",
+    "task_id",
+    "started_at",
+    "ended_at",
+    "duration_seconds",
+    "completed",
+)
+ROLLUP_COLUMNS = ("period", "user_id", "sessions", "focus_seconds")
+
+# 集計単位ごとの期間フォーマット（SQLiteのstrftime形式）
+ROLLUP_FORMATS = {
+    "hour": "%Y-%m-%d %H:00",
+    "day": "%Y-%m-%d",
+    "month": "%Y-%m",
+}
+
+
+def rollup_bounds(
+    since: datetime,
+    until: datetime,
+    granularity: str
+) -> Tuple[datetime, datetime]:
+    """
+    期間を集計単位の境界に揃える（開始は切り捨て、終了は切り上げ）
+    同じ集計期間を含む範囲が同じ値になるため、キャッシュのキーに使用できる
+    Args:
+        since: 開始時刻
+        until: 終了時刻
+        granularity: 集計単位（"hour"、"day"、"month"）
+    Returns:
+        (揃えた開始時刻, 揃えた終了時刻)
+    """
+    if granularity not in ROLLUP_FORMATS:
+        raise ValueError(f"不明な集計単位です: {granularity}")
+
+    def floor(value: datetime) -> datetime:
+        value = value.replace(minute=0, second=0, microsecond=0)
+        if granularity in ("day", "month"):
+            value = value.replace(hour=0)
+        if granularity == "month":
+            value = value.replace(day=1)
+        return value
+
+    start, end = floor(since), floor(until)
+    if end != until:
+        if granularity == "hour":
+            end += timedelta(hours=1)
+        elif granularity == "day":
+            end += timedelta(days=1)
+        else:
+            end = end.replace(year=end.year + end.month // 12, month=end.month % 12 + 1)
+    return start, end
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    category TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    task_id INTEGER REFERENCES tasks(id),
+    started_at TEXT NOT NULL,
+    ended_at TEXT NOT NULL,
+    duration_seconds INTEGER NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_started_at
+    ON sessions (started_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_user_started_at
+    ON sessions (user_id, started_at);
+"""
+
+
+class Database:
+    """SQLiteを使用したセッション履歴とタスクの保存クラス"""
+
+    def __init__(self, path: str):
+        """
+        データベースの初期化
+        Args:
+            path: SQLiteデータベースファイルのパス
+        """
+        self.path = path
+        self._lock = threading.Lock()  # 書き込みを直列化するため
+        self._write_queue: "queue.Queue[dict]" = queue.Queue()
+        with closing(self._connect()) as conn, conn:
+            # 複数のワーカープロセスから同時に読み書きできるようWALモードを使用
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+        # 書き込みスレッドはここで開始し、enqueue_sessionが書き込みのロックを
+        # 待つことがないようにする
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        """新しい接続を作成する（読み出しは呼び出しごとに独立した接続を使う）"""
+        return sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+
+    def add_task(self, title: str, category: Optional[str] = None) -> int:
+        """
+        タスクを追加する
+        Args:
+            title: タスク名
+            category: カテゴリ名
+        Returns:
+            追加したタスクのID
+        """
+        with self._lock, closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "INSERT INTO tasks (title, category, created_at) VALUES (?, ?, ?)",
+                (title, category, datetime.now().isoformat(timespec="seconds")),
+            )
+            return cursor.lastrowid
+
+    def record_session(
+        self,
+        user_id: str,
+        started_at: datetime,
+        ended_at: datetime,
+        duration_seconds: int,
+        completed: bool = True,
+        task_id: Optional[int] = None
+    ) -> int:
+        """
+        タイマーセッションを記録する
+        Args:
+            user_id: ユーザー（Fletセッション）の識別子
+            started_at: 開始時刻
+            ended_at: 終了時刻
+            duration_seconds: 集中した秒数
+            completed: 最後まで完了した場合True
+            task_id: 関連するタスクのID
+        Returns:
+            記録したセッションのID
+        """
+        with self._lock, closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "INSERT INTO sessions (user_id, task_id, started_at, ended_at,"
+                " duration_seconds, completed) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    user_id,
+                    task_id,
+                    started_at.isoformat(timespec="seconds"),
+                    ended_at.isoformat(timespec="seconds"),
+                    duration_seconds,
+                    int(completed),
+                ),
+            )
+            return cursor.lastrowid
+
+    def enqueue_session(self, **session):
+        """
+        セッションの記録を書き込みキューに追加する（ブロックしない）
+        タイマースレッドなど、ロック待ちで止めたくないスレッドから使用する
+        Args:
+            session: record_sessionに渡す引数
+        """
+        self._write_queue.put(session)
+
+    def flush(self):
+        """書き込みキューに追加された記録がすべて書き込まれるまで待つ"""
+        self._write_queue.join()
+
+    def _write_loop(self):
+        """書き込みキューの記録を順に書き込む（別スレッドで実行）"""
+        while True:
+            session = self._write_queue.get()
+            try:
+                self.record_session(**session)
+            except sqlite3.Error as e:
+                logger.error(f"セッションの記録に失敗しました: {str(e)}")
+            finally:
+                self._write_queue.task_done()
+
+    def iter_tasks(self, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[List[Tuple]]:
+        """
+        タスクを一定件数ごとに読み出す
+        Args:
+            chunk_size: 1回に読み出す行数
+        Yields:
+            TASK_COLUMNSの順に並んだ行のリスト
+        """
+        query = f"SELECT {', '.join(TASK_COLUMNS)} FROM tasks ORDER BY id"
+        yield from self._iter_query(query, (), chunk_size)
+
+    def iter_task_totals(self, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[List[Tuple]]:
+        """
+        タスクごとの合計集中秒数を一定件数ごとに読み出す
+        Args:
+            chunk_size: 1回に読み出す行数
+        Yields:
+            (タスクID, 合計秒数)の行のリスト
+        """
+        query = (
+            "SELECT task_id, SUM(duration_seconds) FROM sessions"
+            " WHERE task_id IS NOT NULL GROUP BY task_id ORDER BY task_id"
+        )
+        yield from self._iter_query(query, (), chunk_size)
+
+    def iter_sessions(
+        self,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+        user_id: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> Iterator[List[Tuple]]:
+        """
+        セッション履歴を一定件数ごとに読み出す
+        Args:
+            chunk_size: 1回に読み出す行数
+            user_id: 指定した場合はそのユーザーのみ
+            since: 指定した場合はこの時刻以降に開始したセッションのみ
+            until: 指定した場合はこの時刻より前に開始したセッションのみ
+        Yields:
+            SESSION_COLUMNSの順に並んだ行のリスト
+        """
+        where, params = self._build_filter(user_id, since, until)
+        query = (
+            f"SELECT {', '.join(SESSION_COLUMNS)} FROM sessions"
+            f"{where} ORDER BY started_at, id"
+        )
+        yield from self._iter_query(query, params, chunk_size)
+
+    def iter_rollups(
+        self,
+        granularity: str = "day",
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+        user_id: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> Iterator[List[Tuple]]:
+        """
+        期間ごとの集中時間の集計を一定件数ごとに読み出す
+        Args:
+            granularity: 集計単位（"hour"、"day"、"month"）
+            chunk_size: 1回に読み出す行数
+            user_id: 指定した場合はそのユーザーのみ
+            since: 指定した場合はこの時刻以降に開始したセッションのみ
+            until: 指定した場合はこの時刻より前に開始したセッションのみ
+        Yields:
+            ROLLUP_COLUMNSの順に並んだ行のリスト
+        """
+        if granularity not in ROLLUP_FORMATS:
+            raise ValueError(f"不明な集計単位です: {granularity}")
+        where, params = self._build_filter(user_id, since, until)
+        query = (
+            "SELECT strftime(?, started_at) AS period, user_id,"
+            " COUNT(*), SUM(duration_seconds) FROM sessions"
+            f"{where} GROUP BY period, user_id ORDER BY period, user_id"
+        )
+        yield from self._iter_query(
+            query, (ROLLUP_FORMATS[granularity], *params), chunk_size
+        )
+
+    @staticmethod
+    def _build_filter(
+        user_id: Optional[str],
+        since: Optional[datetime],
+        until: Optional[datetime]
+    ) -> Tuple[str, Tuple]:
+        """セッション検索用のWHERE句とパラメータを組み立てる"""
+        clauses, params = [], []
+        if user_id is not None:
+            clauses.append("user_id = ?")
+            params.append(user_id)
+        if since is not None:
+            clauses.append("started_at >= ?")
+            params.append(since.isoformat(timespec="seconds"))
+        if until is not None:
+            clauses.append("started_at < ?")
+            params.append(until.isoformat(timespec="seconds"))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, tuple(params)
+
+    def _iter_query(
+        self,
+        query: str,
+        params: Sequence,
+        chunk_size: int
+    ) -> Iterator[List[Tuple]]:
+        """クエリ結果をfetchmanyで分割して読み出す"""
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
@@ -0,0 +1,82 @@
+"""グラフ表示用の時系列データの間引き処理"""
+from typing import List, Sequence, Tuple
+
+Point = Tuple[float, float]
+
+
+def lttb(points: Sequence[Point], threshold: int) -> List[Point]:
+    """
+    Largest-Triangle-Three-Buckets法で系列を間引く
+    見た目の形状を保ったまま、指定した点数まで削減する
+    Args:
+        points: x昇順に並んだ(x, y)のシーケンス
+        threshold: 間引き後の点数（3以上）
+    Returns:
+        間引き後の点のリスト（最初と最後の点は必ず含む）
+    """
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0  # 直前に選んだ点のインデックス
+
+    for i in range(threshold - 2):
+        # 次のバケットの平均点
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        next_count = next_end - next_start
+        avg_x = sum(p[0] for p in points[next_start:next_end]) / next_count
+        avg_y = sum(p[1] for p in points[next_start:next_end]) / next_count
+
+        # 現在のバケットから三角形の面積が最大となる点を選ぶ
+        start = int(i * bucket_size) + 1
+        end = next_start
+        ax, ay = points[a]
+        max_area = -1.0
+        chosen = start
+        for j in range(start, end):
+            x, y = points[j]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > max_area:
+                max_area = area
+                chosen = j
+
+        sampled.append(points[chosen])
+        a = chosen
+
+    sampled.append(points[-1])
+    return sampled
+
+
+def minmax(points: Sequence[Point], buckets: int) -> List[Point]:
+    """
+    バケットごとの最小値と最大値を残して系列を間引く
+    スパイクを取りこぼさないため、棒グラフなどに適している
+    Args:
+        points: x昇順に並んだ(x, y)のシーケンス
+        buckets: バケット数（結果は最大でこの2倍の点数になる）
+    Returns:
+        間引き後の点のリスト
+    """
+    n = len(points)
+    if buckets <= 0 or n <= buckets * 2:
+        return list(points)
+
+    sampled = []
+    bucket_size = n / buckets
+    for i in range(buckets):
+        bucket = points[int(i * bucket_size):int((i + 1) * bucket_size)]
+        if not bucket:
+            continue
+        low = min(bucket, key=lambda p: p[1])
+        high = max(bucket, key=lambda p: p[1])
+        # x順を保って追加する
+        if low is high:
+            sampled.append(low)
+        elif low[0] <= high[0]:
+            sampled.extend((low, high))
+        else:
+            sampled.extend((high, low))
+    return sampled
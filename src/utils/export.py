@@ -0,0 +1,175 @@
+"""セッション履歴とタスクのストリーミングエクスポート"""
+import csv
+from datetime import datetime
+import json
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .constants import EXPORT_CHUNK_SIZE
+from .database import (
+    Database,
+    ROLLUP_COLUMNS,
+    SESSION_COLUMNS,
+    TASK_COLUMNS,
+)
+
+# pyarrowはParquet出力時のみ必要なため任意の依存とする
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+Chunks = Iterable[List[Tuple]]
+
+# Parquetの列の型（最初のチャンクが全てNULLの列でも型が変わらないよう明示する）
+_PARQUET_TYPES = {
+    "id": "int64",
+    "user_id": "string",
+    "task_id": "int64",
+    "started_at": "string",
+    "ended_at": "string",
+    "duration_seconds": "int64",
+    "completed": "int64",
+    "title": "string",
+    "category": "string",
+    "created_at": "string",
+    "period": "string",
+    "sessions": "int64",
+    "focus_seconds": "int64",
+}
+
+
+def parquet_schema(columns: Sequence[str]) -> "pa.Schema":
+    """
+    列名からParquetのスキーマを作成する
+    Args:
+        columns: 列名
+    Returns:
+        pyarrowのスキーマ
+    """
+    return pa.schema([
+        (name, pa.type_for_alias(_PARQUET_TYPES[name])) for name in columns
+    ])
+
+
+def export_csv(chunks: Chunks, columns: Sequence[str], path: str) -> int:
+    """
+    チャンクごとにCSVへ書き出す
+    Args:
+        chunks: 行のリストを順に返すイテラブル
+        columns: 列名
+        path: 出力先のファイルパス
+    Returns:
+        書き出した行数
+    """
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for rows in chunks:
+            writer.writerows(rows)
+            count += len(rows)
+    return count
+
+
+def export_jsonl(chunks: Chunks, columns: Sequence[str], path: str) -> int:
+    """
+    チャンクごとにJSON Linesへ書き出す
+    Args:
+        chunks: 行のリストを順に返すイテラブル
+        columns: 列名
+        path: 出力先のファイルパス
+    Returns:
+        書き出した行数
+    """
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for rows in chunks:
+            f.writelines(
+                json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n"
+                for row in rows
+            )
+            count += len(rows)
+    return count
+
+
+def export_parquet(chunks: Chunks, columns: Sequence[str], path: str) -> int:
+    """
+    チャンクごとにParquetの行グループとして書き出す（pyarrowが必要）
+    Args:
+        chunks: 行のリストを順に返すイテラブル
+        columns: 列名
+        path: 出力先のファイルパス
+    Returns:
+        書き出した行数
+    """
+    if pa is None:
+        raise RuntimeError("Parquet形式で出力するにはpyarrowが必要です")
+
+    schema = parquet_schema(columns)
+    count = 0
+    # 行が無い場合も列名だけのファイルを作成する
+    with pq.ParquetWriter(path, schema) as writer:
+        for rows in chunks:
+            table = pa.Table.from_pylist(
+                [dict(zip(columns, row)) for row in rows],
+                schema=schema,
+            )
+            writer.write_table(table)
+            count += len(rows)
+    return count
+
+
+EXPORT_FORMATS: Dict[str, Callable[[Chunks, Sequence[str], str], int]] = {
+    "csv": export_csv,
+    "jsonl": export_jsonl,
+    "parquet": export_parquet,
+}
+
+
+def export_history(
+    database: Database,
+    path: str,
+    fmt: str = "csv",
+    table: str = "sessions",
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    granularity: str = "day",
+    user_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None
+) -> int:
+    """
+    履歴をファイルへエクスポートする
+    データベースから一定件数ずつ読み出して書き出すため、件数に関わらずメモリ使用量は一定
+    Args:
+        database: 読み出し元のデータベース
+        path: 出力先のファイルパス
+        fmt: 出力形式（"csv"、"jsonl"、"parquet"）
+        table: 出力対象（"sessions"、"tasks"、集計済みの"rollups"）
+        chunk_size: 1回に読み出す行数
+        granularity: table="rollups"の場合の集計単位
+        user_id: セッションを絞り込むユーザー
+        since: この時刻以降に開始したセッションのみ
+        until: この時刻より前に開始したセッションのみ
+    Returns:
+        書き出した行数
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"不明な出力形式です: {fmt}")
+
+    if table == "sessions":
+        columns = SESSION_COLUMNS
+        chunks = database.iter_sessions(chunk_size, user_id, since, until)
+    elif table == "tasks":
+        columns = TASK_COLUMNS
+        chunks = database.iter_tasks(chunk_size)
+    elif table == "rollups":
+        columns = ROLLUP_COLUMNS
+        chunks = database.iter_rollups(
+            granularity, chunk_size, user_id, since, until
+        )
+    else:
+        raise ValueError(f"不明な出力対象です: {table}")
+
+    return EXPORT_FORMATS[fmt](chunks, columns, path)
@@ -0,0 +1,357 @@
+"""タイマー完了通知のバッチ配信処理"""
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from datetime import datetime
+import json
+import logging
+import platform
+import queue
+import shutil
+import subprocess
+import threading
+import time
+import urllib.request
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class Notification(NamedTuple):
+    """1件の通知"""
+    user_id: str
+    title: str
+    message: str
+    key: str                # 重複判定用のキー
+    created_at: datetime
+
+
+class NotificationSink(ABC):
+    """通知の配信先の基底クラス"""
+
+    @abstractmethod
+    def deliver(self, batch: List[Notification]):
+        """
+        通知をまとめて配信する
+        Args:
+            batch: 配信する通知のリスト
+        """
+
+
+class DesktopSink(NotificationSink):
+    """OSのデスクトップ通知を使用する配信先"""
+
+    def __init__(self):
+        """利用可能な通知コマンドを検出する"""
+        system = platform.system()
+        if system == "Darwin" and shutil.which("osascript"):
+            self._command = self._osascript
+        elif system == "Linux" and shutil.which("notify-send"):
+            self._command = self._notify_send
+        else:
+            self._command = None
+
+    @staticmethod
+    def _osascript(title: str, message: str) -> List[str]:
+        """macOS用の通知コマンド"""
+        script = f"display notification {json.dumps(message)} with title {json.dumps(title)}"
+        return ["osascript", "-e", script]
+
+    @staticmethod
+    def _notify_send(title: str, message: str) -> List[str]:
+        """Linux用の通知コマンド"""
+        return ["notify-send", title, message]
+
+    def deliver(self, batch: List[Notification]):
+        """複数件ある場合は1件の通知にまとめて表示する"""
+        if not batch:
+            return
+        if len(batch) == 1:
+            title, message = batch[0].title, batch[0].message
+        else:
+            title = f"{len(batch)}件のタイマーが完了しました"
+            message = "\n".join(n.message for n in batch[:5])
+
+        if self._command is None:
+            logger.info(f"{title}: {message}")
+            return
+        subprocess.run(self._command(title, message), check=False, timeout=5)
+
+
+class BannerSink(NotificationSink):
+    """各ユーザーのページ内バナーに表示する配信先"""
+
+    def __init__(self):
+        """配信先の初期化"""
+        self._handlers: Dict[str, Callable[[List[Notification]], None]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, user_id: str, show: Callable[[List[Notification]], None]):
+        """
+        ユーザーのバナー表示処理を登録する
+        Args:
+            user_id: ユーザー（Fletセッション）の識別子
+            show: 通知のリストを受け取ってバナーを表示するコールバック
+        """
+        with self._lock:
+            self._handlers[user_id] = show
+
+    def unregister(self, user_id: str):
+        """
+        ユーザーのバナー表示処理の登録を解除する
+        Args:
+            user_id: ユーザー（Fletセッション）の識別子
+        """
+        with self._lock:
+            self._handlers.pop(user_id, None)
+
+    def deliver(self, batch: List[Notification]):
+        """ユーザーごとにまとめて1回だけ表示処理を呼び出す"""
+        by_user: Dict[str, List[Notification]] = defaultdict(list)
+        for notification in batch:
+            by_user[notification.user_id].append(notification)
+
+        with self._lock:
+            handlers = dict(self._handlers)
+        for user_id, notifications in by_user.items():
+            show = handlers.get(user_id)
+            if show is None:
+                continue
+            try:
+                show(notifications)
+            except Exception as e:
+                # 再接続待ちのページなどで失敗しても、他のユーザーへの表示は続ける
+                logger.warning(
+                    f"バナーを表示できませんでした（{user_id}）: {str(e)}"
+                )
+
+
+class WebhookSink(NotificationSink):
+    """ローカルのWebhookエンドポイントにJSONで送信する配信先"""
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        """
+        配信先の初期化
+        Args:
+            url: 送信先のURL
+            timeout: 送信のタイムアウト（秒）
+        """
+        self.url = url
+        self.timeout = timeout
+
+    def deliver(self, batch: List[Notification]):
+        """バッチ全体を1回のPOSTで送信する"""
+        body = json.dumps(
+            [
+                {
+                    "user_id": n.user_id,
+                    "title": n.title,
+                    "message": n.message,
+                    "created_at": n.created_at.isoformat(timespec="seconds"),
+                }
+                for n in batch
+            ],
+            ensure_ascii=False,
+        ).encode("utf-8")
+        request = urllib.request.Request(
+            self.url,
+            data=body,
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+class NotificationDispatcher:
+    """
+    通知を非同期にまとめて配信するクラス
+    キューへの追加はブロックしないため、タイマースレッドから安全に呼び出せる
+    """
+
+    def __init__(
+        self,
+        sinks: Sequence[NotificationSink],
+        max_queue: int = 10000,
+        batch_size: int = 500,
+        batch_interval: float = 0.5,
+        dedupe_window: float = 60.0,
+        rate_limit: int = 10,
+        rate_period: float = 60.0
+    ):
+        """
+        ディスパッチャの初期化
+        Args:
+            sinks: 配信先のリスト
+            max_queue: キューの最大件数（超えた通知は破棄される）
+            batch_size: 1回に配信する最大件数
+            batch_interval: バッチを集める最大待ち時間（秒）
+            dedupe_window: 同じユーザー・キーの通知を重複とみなす時間（秒）
+            rate_limit: 1ユーザーあたりrate_period秒間に配信する最大件数
+            rate_period: レート制限の期間（秒）
+        """
+        self.sinks = list(sinks)
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.dedupe_window = dedupe_window
+        self.rate_limit = rate_limit
+        self.rate_period = rate_period
+
+        self._queue: "queue.Queue[Notification]" = queue.Queue(maxsize=max_queue)
+        self._recent: Dict[tuple, float] = {}          # 重複判定用
+        self._sent: Dict[str, Deque[float]] = defaultdict(deque)  # レート制限用
+        self._stop_event = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+        # 統計情報（複数のタイマースレッドから更新されるためロックで保護する）
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "queued": 0,
+            "dropped": 0,
+            "deduplicated": 0,
+            "rate_limited": 0,
+            "delivered": 0,
+            "batches": 0,
+        }
+
+    def start(self):
+        """配信スレッドを開始する"""
+        if self._worker and self._worker.is_alive():
+            return
+        self._stop_event.clear()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def stop(self, timeout: float = 5.0):
+        """
+        配信スレッドを停止する（キューに残った通知は配信してから終了する）
+        Args:
+            timeout: 停止を待つ最大時間（秒）
+        """
+        self._stop_event.set()
+        if self._worker:
+            self._worker.join(timeout)
+        self._worker = None
+
+    def notify(
+        self,
+        user_id: str,
+        title: str,
+        message: str,
+        key: Optional[str] = None
+    ) -> bool:
+        """
+        通知をキューに追加する（ブロックしない）
+        Args:
+            user_id: ユーザー（Fletセッション）の識別子
+            title: 通知のタイトル
+            message: 通知の本文
+            key: 重複判定用のキー（Noneの場合はタイトルを使用）
+        Returns:
+            bool: キューに追加できた場合True
+        """
+        notification = Notification(
+            user_id, title, message, key or title, datetime.now()
+        )
+        try:
+            self._queue.put_nowait(notification)
+        except queue.Full:
+            self._count("dropped")
+            return False
+        self._count("queued")
+        return True
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """統計情報のコピーを取得"""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def _count(self, name: str, amount: int = 1):
+        """統計情報を加算する"""
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def flush(self):
+        """キューに溜まっている通知をすべて配信する（呼び出し元のスレッドで実行）"""
+        while True:
+            batch = self._collect(wait=False)
+            if not batch:
+                break
+            self._dispatch(batch)
+
+    def _run(self):
+        """配信スレッドのメインループ"""
+        while not self._stop_event.is_set():
+            batch = self._collect(wait=True)
+            if batch:
+                self._dispatch(batch)
+        self.flush()
+
+    def _collect(self, wait: bool) -> List[Notification]:
+        """
+        キューから最大batch_size件を取り出す
+        Args:
+            wait: 最初の1件が来るまで、またはbatch_interval秒まで待つ場合True
+        """
+        batch: List[Notification] = []
+        deadline = time.monotonic() + self.batch_interval
+        while len(batch) < self.batch_size:
+            try:
+                if wait:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _dispatch(self, batch: List[Notification]):
+        """重複除去とレート制限を適用してから各配信先に送る"""
+        now = time.monotonic()
+        self._prune(now)
+
+        accepted = []
+        for notification in batch:
+            dedupe_key = (notification.user_id, notification.key)
+            if dedupe_key in self._recent:
+                self._count("deduplicated")
+                continue
+
+            sent = self._sent[notification.user_id]
+            if len(sent) >= self.rate_limit:
+                self._count("rate_limited")
+                continue
+
+            self._recent[dedupe_key] = now
+            sent.append(now)
+            accepted.append(notification)
+
+        if not accepted:
+            return
+        for sink in self.sinks:
+            try:
+                sink.deliver(accepted)
+            except Exception as e:
+                logger.error(f"通知の配信中にエラーが発生しました: {str(e)}")
+        self._count("delivered", len(accepted))
+        self._count("batches")
+
+    def _prune(self, now: float):
+        """期限切れの重複判定・レート制限の記録を削除する"""
+        expired = [
+            key for key, sent_at in self._recent.items()
+            if now - sent_at >= self.dedupe_window
+        ]
+        for key in expired:
+            del self._recent[key]
+
+        for user_id in list(self._sent):
+            sent = self._sent[user_id]
+            while sent and now - sent[0] >= self.rate_period:
+                sent.popleft()
+            if not sent:
+                del self._sent[user_id]
+
@@ -0,0 +1,262 @@
+"""セッション単位のプロファイリング（cProfileとtracemalloc）"""
+import cProfile
+from collections import deque
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+import weakref
+from typing import Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# tracemallocはプロセス全体で共有されるため、使用中のプロファイラ数で開始・停止を管理する
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+_tracemalloc_owned = False  # このモジュールが開始した場合True
+
+# スナップショットに含めるファイル（タイマーとコンポーネントの割り当てのみ）
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(True, "*/timer/*"),
+    tracemalloc.Filter(True, "*/components/*"),
+    tracemalloc.Filter(True, "*/utils/timer_logic.py"),
+)
+
+
+def _acquire_tracemalloc():
+    """tracemallocの使用を開始する（未開始の場合のみ開始する）"""
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracemalloc_owned = True
+        _tracemalloc_users += 1
+
+
+def _release_tracemalloc():
+    """tracemallocの使用を終了する（最後の利用者で、自ら開始した場合は停止する）"""
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        _tracemalloc_users = max(0, _tracemalloc_users - 1)
+        if _tracemalloc_users == 0 and _tracemalloc_owned:
+            tracemalloc.stop()
+            _tracemalloc_owned = False
+
+
+class SessionProfiler:
+    """1セッションのタイマースレッドとコールバックを計測するクラス"""
+
+    def __init__(self, session_id: str, output_dir: str, max_ticks: int = 10000):
+        """
+        プロファイラの初期化
+        Args:
+            session_id: 出力ファイル名に使用するセッションID
+            output_dir: 出力先のディレクトリ
+            max_ticks: 保持するティック間隔の最大件数
+        """
+        self.session_id = session_id
+        self.output_dir = output_dir
+        self._profile = cProfile.Profile()
+        self._tick_intervals: deque = deque(maxlen=max_ticks)
+        self._last_tick: Optional[float] = None
+        self._enabled = False
+        self._lock = threading.Lock()
+
+    def enable(self) -> bool:
+        """
+        現在のスレッドで計測を開始する
+        Python 3.12以降では、他のセッションのcProfileが動作中の場合は開始できない
+        Returns:
+            bool: 計測を開始できた場合True（失敗した場合は計測なしで続行する）
+        """
+        try:
+            self._profile.enable()
+        except (ValueError, RuntimeError) as e:
+            logger.warning(
+                f"プロファイラを開始できませんでした（{self.session_id}）: {str(e)}"
+            )
+            return False
+        _acquire_tracemalloc()
+        self._last_tick = None
+        self._enabled = True
+        return True
+
+    def disable(self):
+        """現在のスレッドでの計測を終了し、結果をファイルに出力する"""
+        if not self._enabled:
+            return
+        self._profile.disable()
+        try:
+            self.dump()
+        finally:
+            self._enabled = False
+            _release_tracemalloc()
+
+    def record_tick(self):
+        """ティックの呼び出し間隔を記録する（描画の遅延調査用）"""
+        now = time.perf_counter()
+        if self._last_tick is not None:
+            self._tick_intervals.append(now - self._last_tick)
+        self._last_tick = now
+
+    def dump(self):
+        """
+        プロファイル、メモリ割り当てのスナップショット、ティック間隔を出力する
+        ファイル名はセッションIDを元にするため、同じセッションでは上書きされる。
+        tracemallocはプロセス全体を対象とするため、スナップショットは
+        タイマー関連のファイルに絞り込んで出力する
+        """
+        with self._lock:
+            os.makedirs(self.output_dir, exist_ok=True)
+            base = os.path.join(self.output_dir, self.session_id)
+
+            self._profile.dump_stats(f"{base}.prof")
+            if tracemalloc.is_tracing():
+                snapshot = tracemalloc.take_snapshot()
+                snapshot.filter_traces(SNAPSHOT_FILTERS).dump(
+                    f"{base}.tracemalloc"
+                )
+
+            intervals = sorted(self._tick_intervals)
+            summary = {"session_id": self.session_id, "ticks": len(intervals)}
+            if intervals:
+                summary.update(
+                    mean=sum(intervals) / len(intervals),
+                    p50=intervals[len(intervals) // 2],
+                    p99=intervals[int(len(intervals) * 0.99)],
+                    max=intervals[-1],
+                )
+            with open(f"{base}.ticks.json", "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=2)
+
+        logger.info(f"プロファイル結果を出力しました: {base}.*")
+
+
+def load_session_ids(path: str) -> Set[str]:
+    """
+    計測対象のセッションIDを読み込む
+    Args:
+        path: セッションIDを1行に1つ記載したファイルのパス（#以降はコメント）
+    Returns:
+        セッションIDの集合
+    """
+    with open(path, encoding="utf-8") as f:
+        lines = (line.split("#", 1)[0].strip() for line in f)
+        return {line for line in lines if line}
+
+
+class ProfileControl:
+    """
+    管理者が指定したセッションだけを計測するためのクラス
+    実行中のセッションをセッションIDで管理し、ファイルに記載されたセッションの
+    計測を再起動なしで有効化・無効化する。更新時刻のポーリングで監視する
+    """
+
+    def __init__(self, path: str, interval: float = 1.0):
+        """
+        監視の初期化
+        Args:
+            path: 計測対象のセッションIDを記載したファイルのパス
+            interval: 更新を確認する間隔（秒）
+        """
+        self.path = path
+        self.interval = interval
+        self._selected: Set[str] = set()
+        self._mtime: Optional[float] = None
+        self._targets: "weakref.WeakValueDictionary" = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, session_id: str, target):
+        """
+        セッションを登録する（既に指定されているセッションは計測を開始する）
+        対象は set_profiling(enabled: bool) メソッドを持つこと。
+        弱参照で保持するため、期限切れで破棄されたセッションは自動的に外れる
+        Args:
+            session_id: セッションID
+            target: 登録する対象（TimerAppなど）
+        """
+        with self._lock:
+            self._targets[session_id] = target
+            selected = session_id in self._selected
+        if selected:
+            target.set_profiling(True)
+
+    def unregister(self, session_id: str):
+        """
+        セッションの登録を解除する
+        Args:
+            session_id: セッションID
+        """
+        with self._lock:
+            self._targets.pop(session_id, None)
+
+    def start(self):
+        """監視スレッドを開始する（開始前に現在の指定を読み込む）"""
+        self.check()
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """監視スレッドを停止する"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(self.interval)
+        self._thread = None
+
+    def _run(self):
+        """監視スレッドのメインループ"""
+        while not self._stop_event.wait(self.interval):
+            self.check()
+
+    def check(self) -> Set[str]:
+        """
+        ファイルが更新されていれば読み込み、指定が変わったセッションの計測を切り替える
+        ファイルが削除された場合は、すべてのセッションの計測を無効化する
+        Returns:
+            計測を切り替えたセッションIDの集合
+        """
+        try:
+            mtime: Optional[float] = os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            mtime = None
+        if mtime == self._mtime:
+            return set()
+        self._mtime = mtime
+
+        selected: Set[str] = set()
+        if mtime is not None:
+            try:
+                selected = load_session_ids(self.path)
+            except (OSError, UnicodeDecodeError) as e:
+                logger.error(f"計測対象の読み込みに失敗しました: {str(e)}")
+                return set()
+
+        with self._lock:
+            changed = selected ^ self._selected
+            self._selected = selected
+            targets = [
+                (session_id, self._targets.get(session_id))
+                for session_id in changed
+            ]
+
+        toggled = set()
+        for session_id, target in targets:
+            if target is None:
+                continue
+            try:
+                target.set_profiling(session_id in selected)
+                toggled.add(session_id)
+            except Exception as e:
+                logger.error(
+                    f"計測の切り替えに失敗しました（{session_id}）: {str(e)}"
+                )
+        if toggled:
+            logger.info(f"計測を切り替えました: {sorted(toggled)}")
+        return toggled
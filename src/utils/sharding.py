@@ -0,0 +1,301 @@
+"""複数のワーカープロセスにセッションを分散して配信する仕組み"""
+import asyncio
+import logging
+import multiprocessing
+import os
+from typing import Callable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+Backend = Tuple[str, int]
+
+# 振り分け方法
+BALANCER_PROXY = "proxy"  # 組み込みのShardProxy
+BALANCER_NGINX = "nginx"  # 外部のnginx（設定ファイルを出力する）
+
+# ワーカーの割り当てを保持するCookie名
+SHARD_COOKIE = "timer_shard"
+
+
+async def _pipe(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    header: Optional[bytes] = None
+):
+    """
+    一方向のデータをそのまま転送し、終端に達したら送信側だけを閉じる
+    Args:
+        reader: 転送元
+        writer: 転送先
+        header: 最初の行（HTTPのステータス行）の直後に挿入するヘッダー
+    """
+    try:
+        if header is not None:
+            status = await reader.readuntil(b"\r\n")
+            writer.write(status + header)
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+        if writer.can_write_eof():
+            writer.write_eof()
+    except (ConnectionError, OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+        pass
+
+
+def _shard_from_cookie(head: bytes) -> Optional[int]:
+    """
+    HTTPリクエストのヘッダーから割り当て済みのワーカー番号を取り出す
+    Args:
+        head: リクエスト行とヘッダー
+    Returns:
+        ワーカー番号（Cookieが無い場合はNone）
+    """
+    for line in head.split(b"\r\n")[1:]:
+        name, _, value = line.partition(b":")
+        if name.strip().lower() != b"cookie":
+            continue
+        for item in value.split(b";"):
+            key, _, shard = item.strip().partition(b"=")
+            if key == SHARD_COOKIE.encode() and shard.isdigit():
+                return int(shard)
+    return None
+
+
+class ShardProxy:
+    """
+    接続をワーカープロセスに振り分けるHTTP/WebSocketプロキシ
+    外部のロードバランサーを用意できない環境向けの簡易的な実装
+    Cookieの無い接続は接続中のセッションが最も少ないワーカーに割り当て、
+    応答でワーカー番号をCookieに保存する。以降のHTTPとWebSocket（再接続を含む）は
+    同じワーカーに送られるため、NATの背後のクライアントも分散される。
+    ただし全セッションの通信がこの1プロセス（1コア）を経由するため、プロキシ自身の
+    処理能力が全体の上限になる（src/benchmark.pyのproxy_ceilingで確認できる）。
+    上限に近い場合は、nginx_configで出力した設定のnginxを使用する
+    """
+
+    def __init__(self, backends: Sequence[Backend]):
+        """
+        プロキシの初期化
+        Args:
+            backends: ワーカーの(ホスト, ポート)のリスト
+        """
+        if not backends:
+            raise ValueError("ワーカーが1つ以上必要です")
+        self.backends = list(backends)
+        self._active = [0] * len(self.backends)  # ワーカーごとの接続数
+
+    def choose(self) -> int:
+        """
+        新しいクライアントの振り分け先を選ぶ
+        Returns:
+            接続数が最も少ないワーカーの番号
+        """
+        return min(range(len(self.backends)), key=self._active.__getitem__)
+
+    async def handle(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ):
+        """1つのクライアント接続をワーカーに中継する"""
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            writer.close()
+            return
+
+        index = _shard_from_cookie(head)
+        cookie = None
+        if index is None or index >= len(self.backends):
+            index = self.choose()
+            cookie = (
+                f"Set-Cookie: {SHARD_COOKIE}={index}; Path=/; HttpOnly; "
+                f"SameSite=Lax\r\n"
+            ).encode("ascii")
+
+        host, port = self.backends[index]
+        try:
+            backend_reader, backend_writer = await asyncio.open_connection(
+                host, port
+            )
+        except OSError as e:
+            logger.error(f"ワーカー {host}:{port} に接続できません: {str(e)}")
+            writer.close()
+            return
+
+        self._active[index] += 1
+        try:
+            backend_writer.write(head)
+            await asyncio.gather(
+                _pipe(reader, backend_writer),
+                _pipe(backend_reader, writer, cookie),
+            )
+        finally:
+            self._active[index] -= 1
+            backend_writer.close()
+            writer.close()
+
+    async def serve(self, host: str, port: int):
+        """
+        プロキシを起動し、停止されるまで待ち受ける
+        Args:
+            host: 待ち受けるホスト
+            port: 待ち受けるポート
+        """
+        server = await asyncio.start_server(self.handle, host, port)
+        logger.info(
+            f"{host}:{port} で待ち受けを開始しました"
+            f"（ワーカー数: {len(self.backends)}）"
+        )
+        async with server:
+            await server.serve_forever()
+
+
+def nginx_config(backends: Sequence[Backend], port: int) -> str:
+    """
+    ワーカーに振り分けるnginxの設定を作成する
+    ShardProxyと同様に、初回のリクエストで割り当てたワーカーをCookieに保存し、
+    以降のHTTPとWebSocket（再接続を含む）は同じワーカーに送る。
+    中継はnginxのワーカープロセスで行われるため、Pythonの1プロセスが上限にならない
+    Args:
+        backends: ワーカーの(ホスト, ポート)のリスト
+        port: nginxが待ち受けるポート
+    Returns:
+        nginx -c で指定できる設定ファイルの内容
+    """
+    if not backends:
+        raise ValueError("ワーカーが1つ以上必要です")
+    servers = "\n".join(
+        f"        server {host}:{backend_port};" for host, backend_port in backends
+    )
+    return f"""worker_processes auto;
+
+events {{
+    worker_connections 10240;
+}}
+
+http {{
+    # Cookieが無い場合はリクエストごとのIDで新しく割り当てる
+    map $cookie_{SHARD_COOKIE} $timer_shard {{
+        ""      $request_id;
+        default $cookie_{SHARD_COOKIE};
+    }}
+
+    map $http_upgrade $connection_upgrade {{
+        default upgrade;
+        ""      close;
+    }}
+
+    upstream timer_workers {{
+        hash $timer_shard consistent;
+{servers}
+    }}
+
+    server {{
+        listen {port};
+
+        location / {{
+            proxy_pass http://timer_workers;
+            proxy_http_version 1.1;
+            proxy_set_header Upgrade $http_upgrade;
+            proxy_set_header Connection $connection_upgrade;
+            proxy_set_header Host $host;
+            proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
+            proxy_read_timeout 1h;
+            add_header Set-Cookie "{SHARD_COOKIE}=$timer_shard; Path=/; HttpOnly; SameSite=Lax";
+        }}
+    }}
+}}
+"""
+
+
+def start_workers(
+    run_worker: Callable[[int], None],
+    count: int,
+    base_port: int
+) -> List[multiprocessing.Process]:
+    """
+    ワーカープロセスを起動する
+    Args:
+        run_worker: ポート番号を受け取ってアプリを起動する関数（pickle可能であること）
+        count: ワーカー数
+        base_port: 最初のワーカーのポート（以降は連番）
+    Returns:
+        起動したプロセスのリスト
+    """
+    context = multiprocessing.get_context("spawn")
+    processes = []
+    for i in range(count):
+        process = context.Process(
+            target=run_worker,
+            args=(base_port + i,),
+            daemon=True,
+        )
+        process.start()
+        processes.append(process)
+    return processes
+
+
+def stop_workers(processes: Sequence[multiprocessing.Process]):
+    """
+    ワーカープロセスを停止する
+    Args:
+        processes: start_workersで起動したプロセスのリスト
+    """
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.join(5)
+
+
+def serve_sharded(
+    run_worker: Callable[[int], None],
+    workers: int,
+    host: str,
+    port: int,
+    base_port: int,
+    worker_host: str = "127.0.0.1",
+    balancer: str = BALANCER_PROXY,
+    config_path: str = "nginx.conf"
+):
+    """
+    ワーカープロセスを起動し、セッションを分散する
+    各ワーカーは独立したスケジューラ（タイマースレッド）を持ち、
+    履歴や統計は共有のデータベースファイルを通じて同期される
+    Args:
+        run_worker: ポート番号を受け取ってアプリを起動する関数
+        workers: ワーカー数（0以下の場合はCPUコア数）
+        host: 公開するホスト
+        port: 公開するポート
+        base_port: 最初のワーカーのポート
+        worker_host: ワーカーが待ち受けるホスト
+        balancer: 振り分け方法（"proxy"は組み込みのプロキシ、
+            "nginx"は設定ファイルを出力してワーカーのみを起動する）
+        config_path: balancer="nginx"の場合の設定ファイルの出力先
+    """
+    if balancer not in (BALANCER_PROXY, BALANCER_NGINX):
+        raise ValueError(f"不明な振り分け方法です: {balancer}")
+
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    backends = [(worker_host, base_port + i) for i in range(workers)]
+    processes = start_workers(run_worker, workers, base_port)
+    try:
+        if balancer == BALANCER_NGINX:
+            with open(config_path, "w", encoding="utf-8") as f:
+                f.write(nginx_config(backends, port))
+            logger.info(
+                f"nginxの設定を出力しました。"
+                f"nginx -c {os.path.abspath(config_path)} で起動してください"
+            )
+            for process in processes:
+                process.join()
+        else:
+            asyncio.run(ShardProxy(backends).serve(host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_workers(processes)
+
@@ -0,0 +1,286 @@
+"""タスク検索用のインメモリ転置インデックス"""
+from collections import defaultdict
+import re
+import threading
+import unicodedata
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from .constants import EXPORT_CHUNK_SIZE
+from .database import Database
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+_EMPTY: Set = frozenset()
+
+
+def normalize(text: str) -> str:
+    """検索用に文字列を正規化する（全角半角の統一と小文字化）"""
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+class TaskIndex:
+    """
+    タスク名とカテゴリの転置インデックス
+    タスクの追加・削除ごとに差分だけ更新するため、再構築は不要。
+    n-gramはタスクではなく語彙（重複を除いたトークン）に対して作成する。
+    検索語は1つのトークンの中にしか一致しないため、一致したトークンの
+    ポスティングを合わせるだけで済み、タスクごとの部分一致の確認は不要になる
+    """
+
+    def __init__(self, ngram: int = 3):
+        """
+        インデックスの初期化
+        Args:
+            ngram: 部分一致検索に使用するn-gramの長さ。
+                これより短い検索語は、短い部分文字列の索引から直接引く
+        """
+        self.ngram = ngram
+        self._texts: Dict[int, str] = {}                    # 正規化済みの検索対象文字列
+        self._tasks: Dict[int, Tuple[str, Optional[str]]] = {}
+        self._categories: Dict[str, Set[int]] = defaultdict(set)
+        self._short_grams: Dict[str, Set[int]] = defaultdict(set)  # 短い語の部分一致用
+        self._token_tasks: Dict[str, Set[int]] = defaultdict(set)  # トークンごとのタスク
+        self._grams: Dict[str, Set[str]] = defaultdict(set)     # n-gramを含むトークン
+        self._totals: Dict[int, int] = defaultdict(int)     # タスクごとの集中秒数
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def add(
+        self,
+        task_id: int,
+        title: str,
+        category: Optional[str] = None,
+        total_seconds: int = 0
+    ):
+        """
+        タスクを追加する（既に存在する場合は更新する）
+        Args:
+            task_id: タスクID
+            title: タスク名
+            category: カテゴリ名
+            total_seconds: これまでの集中秒数
+        """
+        with self._lock:
+            if task_id in self._tasks:
+                self._remove(task_id)
+
+            text = normalize(f"{title} {category or ''}")
+            self._tasks[task_id] = (title, category)
+            self._texts[task_id] = text
+            if category is not None:
+                self._categories[category].add(task_id)
+            for key in self._short_keys(text):
+                self._short_grams[key].add(task_id)
+            for token in set(_TOKEN_PATTERN.findall(text)):
+                if token not in self._token_tasks:
+                    for key in self._gram_keys(token):
+                        self._grams[key].add(token)
+                self._token_tasks[token].add(task_id)
+            if total_seconds:
+                self._totals[task_id] = total_seconds
+
+    def remove(self, task_id: int):
+        """
+        タスクを削除する
+        Args:
+            task_id: タスクID
+        """
+        with self._lock:
+            if task_id in self._tasks:
+                self._remove(task_id)
+
+    def add_session(self, task_id: int, seconds: int):
+        """
+        タスクの集中秒数を加算する
+        Args:
+            task_id: タスクID
+            seconds: 加算する秒数
+        """
+        with self._lock:
+            self._totals[task_id] += seconds
+
+    def get(self, task_id: int) -> Tuple[str, Optional[str], int]:
+        """
+        タスクの情報を取得する
+        Returns:
+            (タスク名, カテゴリ名, 集中秒数)
+        """
+        title, category = self._tasks[task_id]
+        return title, category, self._totals.get(task_id, 0)
+
+    def search(self, query: str, category: Optional[str] = None) -> Set[int]:
+        """
+        タスクを検索する
+        空白で区切った各語をすべて含むタスクを返す（AND検索）
+        Args:
+            query: 検索文字列
+            category: 指定した場合はそのカテゴリのタスクのみ
+        Returns:
+            一致したタスクIDの集合
+        """
+        with self._lock:
+            postings = []
+            if category is not None:
+                postings.append(self._categories.get(category, _EMPTY))
+            for term in set(_TOKEN_PATTERN.findall(normalize(query))):
+                matches = self._match(term)
+                if not matches:
+                    return set()
+                postings.append(matches)
+
+            if not postings:
+                return set(self._tasks)
+            # 最も小さい集合から絞り込む（結果は常に新しい集合になる）
+            postings.sort(key=len)
+            return postings[0].intersection(*postings[1:])
+
+    def _match(self, term: str) -> Set[int]:
+        """
+        1語を部分文字列として含むタスクIDを取得する（語の長さによらず部分一致）
+        内部のポスティングをそのまま返す場合があるため、呼び出し側で変更しないこと
+        """
+        if len(term) < self.ngram:
+            return self._short_grams.get(term, _EMPTY)
+
+        tokens = self._match_tokens(term)
+        if len(tokens) == 1:
+            return self._token_tasks[next(iter(tokens))]
+        return set().union(*(self._token_tasks[token] for token in tokens))
+
+    def _match_tokens(self, term: str) -> Set[str]:
+        """語を部分文字列として含むトークンを語彙から取得する"""
+        keys = self._gram_keys(term)
+        postings = sorted((self._grams.get(key, _EMPTY) for key in keys), key=len)
+        if len(keys) == 1:
+            # 1つのn-gramと等しい語は、そのn-gramを含むトークンすべてに一致する
+            return postings[0]
+        # n-gramをすべて含んでも、離れた位置にある場合は一致しないため確認する
+        # （確認は重複のない語彙に対してのみ行う）
+        return {
+            token for token in postings[0].intersection(*postings[1:])
+            if term in token
+        }
+
+    def _remove(self, task_id: int):
+        """ロック取得済みの状態でタスクを削除する"""
+        text = self._texts.pop(task_id)
+        _title, category = self._tasks.pop(task_id)
+        if category is not None:
+            self._discard(self._categories, category, task_id)
+        for key in self._short_keys(text):
+            self._discard(self._short_grams, key, task_id)
+        for token in set(_TOKEN_PATTERN.findall(text)):
+            self._discard(self._token_tasks, token, task_id)
+            if token not in self._token_tasks:
+                # 語彙から外れたトークンはn-gramの索引からも削除する
+                for key in self._gram_keys(token):
+                    self._discard(self._grams, key, token)
+        self._totals.pop(task_id, None)
+
+    @staticmethod
+    def _discard(postings: Dict[str, Set], key: str, value):
+        """ポスティングから値を削除し、空になった場合はキーごと削除する"""
+        ids = postings.get(key)
+        if ids is not None:
+            ids.discard(value)
+            if not ids:
+                del postings[key]
+
+    def _short_keys(self, text: str) -> Set[str]:
+        """n-gram長未満のすべての部分文字列を列挙する"""
+        return {
+            text[i:i + length]
+            for length in range(1, self.ngram)
+            for i in range(len(text) - length + 1)
+        }
+
+    def _gram_keys(self, text: str) -> Set[str]:
+        """文字列に含まれるn-gramを列挙する"""
+        n = self.ngram
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    @classmethod
+    def load(cls, database: Database, chunk_size: int = EXPORT_CHUNK_SIZE) -> "TaskIndex":
+        """
+        データベースのタスクと集中秒数からインデックスを作成する
+        Args:
+            database: 読み出し元のデータベース
+            chunk_size: 1回に読み出す行数
+        Returns:
+            作成したインデックス
+        """
+        index = cls()
+        for rows in database.iter_tasks(chunk_size):
+            for task_id, title, category, _created_at in rows:
+                index.add(task_id, title, category)
+        for rows in database.iter_task_totals(chunk_size):
+            for task_id, seconds in rows:
+                index.add_session(task_id, seconds)
+        return index
+
+
+class TaskSearch:
+    """
+    入力中の検索をデバウンスし、前回の結果との差分だけを通知するクラス
+    TextFieldのon_changeから呼び出すことを想定している
+    """
+
+    def __init__(
+        self,
+        index: TaskIndex,
+        on_diff: Callable[[List[int], List[int]], None],
+        delay: float = 0.15
+    ):
+        """
+        検索の初期化
+        Args:
+            index: 検索に使用するインデックス
+            on_diff: 結果が変化した時に呼び出されるコールバック。
+                追加されたタスクIDと削除されたタスクIDのリストが渡される
+            delay: 最後の入力から検索を実行するまでの待ち時間（秒）
+        """
+        self.index = index
+        self.on_diff = on_diff
+        self.delay = delay
+        self._current: Set[int] = set()
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def query(self, text: str, category: Optional[str] = None):
+        """
+        検索を予約する（待ち時間内に次の入力があれば取り消される）
+        Args:
+            text: 検索文字列
+            category: カテゴリでの絞り込み
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(
+                self.delay, self.run, args=(text, category)
+            )
+            self._timer.daemon = True
+            self._timer.start()
+
+    def run(self, text: str, category: Optional[str] = None):
+        """
+        検索を即座に実行し、差分があれば通知する
+        Args:
+            text: 検索文字列
+            category: カテゴリでの絞り込み
+        """
+        results = self.index.search(text, category)
+        with self._lock:
+            added = results - self._current
+            removed = self._current - results
+            self._current = results
+        if added or removed:
+            self.on_diff(sorted(added), sorted(removed))
+
+    def cancel(self):
+        """予約中の検索を取り消す"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = None
@@ -0,0 +1,166 @@
+"""実行中に再読み込みできるテーマ設定"""
+import json
+import logging
+import math
+import os
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+from .constants import (
+    COMPLETE_COLOR,
+    GRADIENT_END_COLOR,
+    GRADIENT_START_COLOR,
+    ICON_SIZE,
+    MIN_UPDATE_INTERVAL,
+    TIMER_FONT_SIZE,
+    UNIT_FONT_SIZE,
+    UPDATE_INTERVAL,
+)
+
+logger = logging.getLogger(__name__)
+
+# 設定ファイルで上書きできる項目と既定値
+DEFAULT_THEME: Dict[str, Any] = {
+    "gradient_start_color": GRADIENT_START_COLOR,
+    "gradient_end_color": GRADIENT_END_COLOR,
+    "complete_color": COMPLETE_COLOR,
+    "timer_font_size": TIMER_FONT_SIZE,
+    "unit_font_size": UNIT_FONT_SIZE,
+    "icon_size": ICON_SIZE,
+    "update_interval": UPDATE_INTERVAL,
+}
+
+# 数値の項目の最小値（0以下の大きさや、ビジー待ちになる更新間隔を防ぐ）
+MIN_VALUES: Dict[str, float] = {
+    "timer_font_size": 1,
+    "unit_font_size": 1,
+    "icon_size": 1,
+    "update_interval": MIN_UPDATE_INTERVAL,
+}
+
+
+def load_theme(path: str) -> Dict[str, Any]:
+    """
+    設定ファイルを読み込み、既定値とマージしたテーマを返す
+    Args:
+        path: JSON形式の設定ファイルのパス
+    Returns:
+        テーマ設定の辞書
+    """
+    with open(path, encoding="utf-8") as f:
+        overrides = json.load(f)
+    if not isinstance(overrides, dict):
+        raise ValueError("テーマ設定はJSONオブジェクトで記述してください")
+
+    theme = dict(DEFAULT_THEME)
+    for key, value in overrides.items():
+        if key not in DEFAULT_THEME:
+            logger.warning(f"不明なテーマ設定を無視しました: {key}")
+            continue
+        expected = type(DEFAULT_THEME[key])
+        if expected is float:
+            expected = (int, float)  # 整数での指定も許可する
+        if isinstance(value, bool) or not isinstance(value, expected):
+            raise ValueError(f"テーマ設定 {key} の型が不正です: {value!r}")
+        minimum = MIN_VALUES.get(key)
+        # JSONのNaNやInfinityも不正な値として扱う
+        if minimum is not None and not (math.isfinite(value) and value >= minimum):
+            raise ValueError(
+                f"テーマ設定 {key} は{minimum}以上の値を指定してください: {value!r}"
+            )
+        theme[key] = value
+    return theme
+
+
+class ThemeWatcher:
+    """
+    設定ファイルの更新を監視し、変更された項目だけを登録済みのタイマーに適用するクラス
+    更新時刻のポーリングで監視するため、OSに依存しない
+    """
+
+    def __init__(self, path: str, interval: float = 1.0):
+        """
+        監視の初期化
+        Args:
+            path: 監視する設定ファイルのパス
+            interval: 更新を確認する間隔（秒）
+        """
+        self.path = path
+        self.interval = interval
+        self.current: Dict[str, Any] = dict(DEFAULT_THEME)
+        self._mtime: Optional[float] = None
+        self._targets: "weakref.WeakSet" = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, target):
+        """
+        テーマの変更を受け取る対象を登録する
+        対象は apply_theme(changes: dict) メソッドを持つこと。
+        弱参照で保持するため、セッション終了時の登録解除は不要
+        Args:
+            target: 登録する対象（GradientTimerなど）
+        """
+        with self._lock:
+            self._targets.add(target)
+
+    def start(self):
+        """監視スレッドを開始する（開始前に現在の設定を読み込む）"""
+        self.check()
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """監視スレッドを停止する"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(self.interval)
+        self._thread = None
+
+    def _run(self):
+        """監視スレッドのメインループ"""
+        while not self._stop_event.wait(self.interval):
+            self.check()
+
+    def check(self) -> Dict[str, Any]:
+        """
+        設定ファイルが更新されていれば読み込み、変更を適用する
+        Returns:
+            変更された項目の辞書（変更が無い場合は空）
+        """
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            return {}
+        if mtime == self._mtime:
+            return {}
+        self._mtime = mtime
+
+        try:
+            theme = load_theme(self.path)
+        except (OSError, ValueError) as e:
+            logger.error(f"テーマ設定の読み込みに失敗しました: {str(e)}")
+            return {}
+
+        changes = {
+            key: value for key, value in theme.items()
+            if self.current.get(key) != value
+        }
+        if not changes:
+            return {}
+        self.current = theme
+        logger.info(f"テーマ設定を更新しました: {', '.join(changes)}")
+
+        with self._lock:
+            targets = list(self._targets)
+        for target in targets:
+            try:
+                target.apply_theme(changes)
+            except Exception as e:
+                logger.error(f"テーマの適用中にエラーが発生しました: {str(e)}")
+        return changes
@@ -1,29 +1,39 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 import threading
-from typing import Callable, Optional
+from typing import Callable, Optional, TYPE_CHECKING
 import time
 
+if TYPE_CHECKING:
+    from .profiling import SessionProfiler
+
 class TimerLogic:
     """タイマーの基本ロジックを管理するクラス"""
     
     def __init__(
         self,
         on_tick: Callable[[int], None],
-        on_complete: Callable[[], None]
+        on_complete: Callable[[], None],
+        profiler: Optional["SessionProfiler"] = None,
+        update_interval: float = 0.1
     ):
         """
         タイマーロジックの初期化
         Args:
             on_tick: 毎秒呼び出されるコールバック関数。残り秒数が渡される
             on_complete: タイマー完了時に呼び出されるコールバック関数
+            profiler: タイマースレッドを計測するプロファイラ（Noneの場合は計測しない）
+            update_interval: 更新間隔（秒）。実行中に変更すると次の更新から反映される
         """
         self.on_tick = on_tick
         self.on_complete = on_complete
+        self.profiler = profiler
+        self.update_interval = update_interval
         
         # タイマーの状態管理
         self._is_running = False
         self._total_seconds = 0
         self._remaining_seconds = 0
+        self._paused_elapsed = 0.0         # 一時停止までに経過した秒数
         self._start_time: Optional[datetime] = None
         self._timer_thread: Optional[threading.Thread] = None
         self._lock = threading.Lock()  # スレッドセーフな操作のため
@@ -44,6 +54,7 @@ class TimerLogic:
             if self._remaining_seconds == 0:
                 self._total_seconds = minutes * 60
                 self._remaining_seconds = self._total_seconds
+                self._paused_elapsed = 0.0
                 
             self._start_time = datetime.now()
             self._is_running = True
@@ -61,6 +72,12 @@ class TimerLogic:
         with self._lock:
             if self._is_running:
                 self._is_running = False
+                # 再開時に続きから計測できるよう経過秒数を小数のまま加算
+                if self._start_time:
+                    self._paused_elapsed += (
+                        datetime.now() - self._start_time
+                    ).total_seconds()
+                self._start_time = None
                 if self._timer_thread:
                     self._timer_thread.join(0.1)
                 self._timer_thread = None
@@ -74,43 +91,73 @@ class TimerLogic:
             self._timer_thread = None
             self._total_seconds = 0
             self._remaining_seconds = 0
+            self._paused_elapsed = 0.0
             self._start_time = None
 
     def _update_timer(self):
         """タイマー更新のメインループ（別スレッドで実行）"""
-        while self._is_running:
-            with self._lock:
-                if not self._start_time:
-                    break
+        # プロファイラが有効な場合のみスレッド内で計測する
+        # （開始できなかった場合は計測なしでタイマーを続行する）
+        profiler = self.profiler
+        if profiler is not None and not profiler.enable():
+            profiler = None
+        try:
+            while self._is_running:
+                with self._lock:
+                    # ロック待ちの間に一時停止・リセットされた場合は終了
+                    if not self._is_running or not self._start_time:
+                        break
                     
-                # 経過時間の計算
-                elapsed = datetime.now() - self._start_time
-                self._remaining_seconds = max(
-                    0,
-                    self._total_seconds - int(elapsed.total_seconds())
-                )
+                    # 経過時間の計算
+                    elapsed = datetime.now() - self._start_time
+                    self._remaining_seconds = max(
+                        0,
+                        self._total_seconds - int(
+                            self._paused_elapsed + elapsed.total_seconds()
+                        )
+                    )
                 
-                # コールバックの呼び出し
-                self.on_tick(self._remaining_seconds)
+                    # コールバックの呼び出し
+                    self.on_tick(self._remaining_seconds)
                 
-                # タイマー完了チェック
-                if self._remaining_seconds <= 0:
-                    self._is_running = False
-                    self.on_complete()
-                    break
+                    # タイマー完了チェック
+                    if self._remaining_seconds <= 0:
+                        self._is_running = False
+                        self.on_complete()
+                        break
             
-            time.sleep(0.1)  # CPU負荷軽減
+                time.sleep(self.update_interval)  # CPU負荷軽減
+        finally:
+            if profiler is not None:
+                profiler.disable()
 
     @property
     def is_running(self) -> bool:
         """タイマーが実行中かどうか"""
         return self._is_running
 
+    @property
+    def total_seconds(self) -> int:
+        """設定された合計秒数を取得"""
+        return self._total_seconds
+
     @property
     def remaining_seconds(self) -> int:
         """残り秒数を取得"""
         return self._remaining_seconds
 
+    @property
+    def deadline(self) -> Optional[datetime]:
+        """
+        タイマーが完了する予定時刻を取得
+        実行中でない場合はNoneを返す
+        """
+        if not self._is_running or not self._start_time:
+            return None
+        return self._start_time + timedelta(
+            seconds=self._total_seconds - self._paused_elapsed
+        )
+
     @property
     def progress(self) -> float:
         """
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# src 以下の utils などを直接インポートできるようにする
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
@@ -0,0 +1,52 @@
+import threading
+import time
+
+from utils.color_transition import ColorTransition
+
+
+class _SlowApply:
+    """色の適用に時間がかかるページ更新を模擬する"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.applied = []  # (適用した時刻, スレッド)
+        self._lock = threading.Lock()
+
+    def __call__(self, color: str, duration_ms: int):
+        time.sleep(self.delay)
+        with self._lock:
+            self.applied.append((time.monotonic(), threading.current_thread()))
+
+
+def test_quick_restart_leaves_only_one_running_thread():
+    """停止直後に再開しても、前回のスレッドは終了して色を適用しない"""
+    apply = _SlowApply(0.2)
+    transition = ColorTransition(
+        apply, ["#000000", "#FFFFFF"], segment_seconds=0.05,
+        max_fps=20, client_animation=False,
+    )
+    transition.start()
+    time.sleep(0.05)  # 最初のスレッドが適用中のうちに切り替える
+    transition.stop()
+    restarted = time.monotonic()
+    transition.start()
+    time.sleep(0.5)
+    transition.stop()
+
+    threads = {thread for applied_at, thread in apply.applied if applied_at > restarted}
+    assert len(threads) == 1
+
+
+def test_no_color_is_applied_after_stop_returns():
+    """stop()から戻った後は、適用中だったスレッドも色を変更しない"""
+    apply = _SlowApply(0.2)
+    transition = ColorTransition(apply, ["#000000", "#FFFFFF"], segment_seconds=0.01)
+    transition.start()
+    time.sleep(0.05)
+    transition.stop()
+    count = len(apply.applied)
+    time.sleep(0.4)
+
+    assert count == 1
+    assert len(apply.applied) == count
+    assert not transition.is_running
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+import sqlite3
+import time
+
+from utils.database import Database, rollup_bounds
+
+
+def _session(user_id: str) -> dict:
+    started_at = datetime(2024, 11, 1, 9, 0)
+    return dict(
+        user_id=user_id,
+        started_at=started_at,
+        ended_at=started_at + timedelta(minutes=25),
+        duration_seconds=1500,
+    )
+
+
+def test_enqueue_does_not_wait_while_database_is_locked(tmp_path):
+    """データベースが他の接続にロックされていても、キューへの追加はすぐに戻る"""
+    path = str(tmp_path / "timer.db")
+    database = Database(path)
+    blocker = sqlite3.connect(path, isolation_level=None)
+    blocker.execute("BEGIN EXCLUSIVE")
+    try:
+        database.enqueue_session(**_session("a"))
+        time.sleep(0.2)  # 書き込みスレッドがロック待ちに入るまで待つ
+
+        started = time.perf_counter()
+        database.enqueue_session(**_session("b"))
+        assert time.perf_counter() - started < 0.05
+    finally:
+        blocker.execute("COMMIT")
+        blocker.close()
+
+    database.flush()
+    with sqlite3.connect(path) as conn:
+        users = [row[0] for row in conn.execute("SELECT user_id FROM sessions ORDER BY id")]
+    assert users == ["a", "b"]
+
+
+def test_rollup_bounds_snap_to_whole_periods():
+    """期間は集計単位の境界に揃えられ、近い範囲は同じ値になる"""
+    since = datetime(2024, 11, 1, 9, 12, 30)
+    until = datetime(2024, 12, 31, 21, 45)
+
+    assert rollup_bounds(since, until, "hour") == (
+        datetime(2024, 11, 1, 9), datetime(2024, 12, 31, 22)
+    )
+    assert rollup_bounds(since, until, "day") == (
+        datetime(2024, 11, 1), datetime(2025, 1, 1)
+    )
+    assert rollup_bounds(since, until, "month") == (
+        datetime(2024, 11, 1), datetime(2025, 1, 1)
+    )
+    # 境界ちょうどの終了時刻は切り上げない
+    assert rollup_bounds(since, datetime(2024, 11, 2), "day")[1] == datetime(2024, 11, 2)
+    # ズームの中心が数分ずれても同じ範囲になる
+    shift = timedelta(minutes=7)
+    assert rollup_bounds(since + shift, until + shift, "day") == rollup_bounds(since, until, "day")
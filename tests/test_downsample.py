@@ -0,0 +1,61 @@
+import math
+import random
+
+import pytest
+
+from utils.downsample import lttb, minmax
+
+
+def _series(n: int, seed: int = 0):
+    """x昇順のランダムな系列"""
+    rng = random.Random(seed)
+    return [(float(x), rng.uniform(0, 100)) for x in range(n)]
+
+
+@pytest.mark.parametrize("n, threshold", [(1000, 100), (1000, 3), (101, 50), (10, 9)])
+def test_lttb_keeps_endpoints_order_and_size(n, threshold):
+    """点数は閾値以下で、最初と最後の点を含み、x順を保つ"""
+    points = _series(n)
+    sampled = lttb(points, threshold)
+
+    assert len(sampled) <= threshold
+    assert sampled[0] == points[0]
+    assert sampled[-1] == points[-1]
+    xs = [x for x, _ in sampled]
+    assert xs == sorted(xs) and len(set(xs)) == len(xs)
+    assert set(sampled) <= set(points)
+
+
+@pytest.mark.parametrize("threshold", [10, 11, 2, 0])
+def test_lttb_passes_through_small_inputs(threshold):
+    """点数が閾値以下の場合や、閾値が3未満の場合はそのまま返す"""
+    points = _series(10)
+    assert lttb(points, threshold) == points
+
+
+def test_lttb_keeps_a_single_peak():
+    """平坦な系列の1点だけのピークは残る"""
+    points = [(float(x), 0.0) for x in range(1000)]
+    points[537] = (537.0, 50.0)
+    assert (537.0, 50.0) in lttb(points, 50)
+
+
+def test_minmax_keeps_spikes_and_order():
+    """各バケットの最大・最小を残すため、スパイクを取りこぼさない"""
+    points = [(float(x), math.sin(x / 50)) for x in range(1000)]
+    points[123] = (123.0, 500.0)
+    points[877] = (877.0, -500.0)
+    sampled = minmax(points, 20)
+
+    assert len(sampled) <= 40
+    assert (123.0, 500.0) in sampled
+    assert (877.0, -500.0) in sampled
+    xs = [x for x, _ in sampled]
+    assert xs == sorted(xs)
+
+
+@pytest.mark.parametrize("buckets", [5, 0, -1])
+def test_minmax_passes_through_small_inputs(buckets):
+    """点数がバケット数の2倍以下の場合や、バケット数が0以下の場合はそのまま返す"""
+    points = _series(10)
+    assert minmax(points, buckets) == points
@@ -0,0 +1,54 @@
+import csv
+from datetime import datetime, timedelta
+import json
+
+import pytest
+
+from utils.database import Database, SESSION_COLUMNS
+from utils.export import export_history
+
+
+@pytest.fixture
+def database(tmp_path):
+    """最初のセッションだけタスクが無い（task_idがNULL）履歴"""
+    database = Database(str(tmp_path / "timer.db"))
+    task_id = database.add_task("資料作成")
+    started_at = datetime(2024, 11, 1, 9, 0)
+    for i in range(3):
+        database.record_session(
+            user_id="user",
+            started_at=started_at + timedelta(hours=i),
+            ended_at=started_at + timedelta(hours=i, minutes=25),
+            duration_seconds=1500,
+            task_id=task_id if i > 0 else None,
+        )
+    return database
+
+
+def test_csv_and_jsonl_write_every_row(database, tmp_path):
+    """チャンクに分けて読み出しても全ての行が書き出される"""
+    csv_path = tmp_path / "sessions.csv"
+    jsonl_path = tmp_path / "sessions.jsonl"
+
+    assert export_history(database, str(csv_path), "csv", chunk_size=2) == 3
+    assert export_history(database, str(jsonl_path), "jsonl", chunk_size=2) == 3
+
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == list(SESSION_COLUMNS)
+    assert len(rows) == 4
+    records = [json.loads(line) for line in jsonl_path.read_text(encoding="utf-8").splitlines()]
+    assert [r["task_id"] for r in records] == [None, 1, 1]
+
+
+def test_parquet_accepts_null_only_first_chunk(database, tmp_path):
+    """最初のチャンクで全てNULLの列があっても、後のチャンクを書き出せる"""
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "sessions.parquet"
+
+    assert export_history(database, str(path), "parquet", chunk_size=1) == 3
+
+    table = pq.read_table(path)
+    assert table.column_names == list(SESSION_COLUMNS)
+    assert str(table.schema.field("task_id").type) == "int64"
+    assert table.column("task_id").to_pylist() == [None, 1, 1]
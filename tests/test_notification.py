@@ -0,0 +1,106 @@
+from datetime import datetime
+import threading
+import time
+
+from utils.notification import (
+    BannerSink,
+    Notification,
+    NotificationDispatcher,
+    NotificationSink,
+)
+
+
+class CollectingSink(NotificationSink):
+    """受け取った通知とバッチ数を記録する配信先"""
+
+    def __init__(self):
+        self.notifications = []
+        self.batches = 0
+        self._lock = threading.Lock()
+
+    def deliver(self, batch):
+        with self._lock:
+            self.notifications.extend(batch)
+            self.batches += 1
+
+
+def test_same_minute_burst_of_10000_completions():
+    """同じ分に10,000件の完了が集中しても、重複除去とレート制限を適用して配信できる"""
+    sink = CollectingSink()
+    dispatcher = NotificationDispatcher(
+        [sink], max_queue=10000, batch_size=500, rate_limit=3
+    )
+    dispatcher.start()
+
+    # 1,000ユーザーがそれぞれ10件（キーは5種類を2回ずつ）を複数スレッドから送る
+    users = 1000
+
+    def complete(offset):
+        for user in range(offset, users, 4):
+            for i in range(10):
+                dispatcher.notify(f"user-{user}", "タイマー完了", "完了", key=f"k{i % 5}")
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=complete, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    dispatcher.stop(timeout=30)
+    elapsed = time.perf_counter() - started
+
+    stats = dispatcher.stats
+    assert stats["queued"] == 10000
+    assert stats["dropped"] == 0
+    # 各ユーザー: k0〜k2を配信、k0〜k2の2回目は重複、k3・k4は2回ともレート制限
+    assert stats["delivered"] == users * 3
+    assert stats["deduplicated"] == users * 3
+    assert stats["rate_limited"] == users * 4
+    assert len(sink.notifications) == users * 3
+    assert len({(n.user_id, n.key) for n in sink.notifications}) == users * 3
+    # バッチ単位でまとめて配信されている
+    assert sink.batches <= 10000 // 500 + 1
+    # 10,000件の処理は十分に速い（最低1,000件/秒）
+    assert 10000 / elapsed > 1000
+
+
+def test_notify_drops_when_queue_is_full():
+    """キューが満杯の場合はブロックせずに破棄する"""
+    dispatcher = NotificationDispatcher([CollectingSink()], max_queue=2)
+
+    results = [dispatcher.notify("user", "完了", "完了", key=str(i)) for i in range(3)]
+
+    assert results == [True, True, False]
+    assert dispatcher.stats["dropped"] == 1
+
+
+def test_repeated_completion_key_is_deduplicated_per_user():
+    """同じキーの通知はユーザーごとに重複除去の期間内で1件だけ配信する"""
+    sink = CollectingSink()
+    dispatcher = NotificationDispatcher([sink])
+
+    for user in ("a", "a", "b"):
+        dispatcher.notify(user, "タイマー完了", "完了", key="timer_complete")
+    dispatcher.flush()
+
+    assert sorted(n.user_id for n in sink.notifications) == ["a", "b"]
+    assert dispatcher.stats["deduplicated"] == 1
+
+
+def test_banner_failure_does_not_block_other_users():
+    """表示に失敗したページ（再接続待ちなど）があっても、他のユーザーには表示する"""
+    sink = BannerSink()
+    shown = []
+
+    def disconnected(notifications):
+        raise RuntimeError("Page has been disconnected")
+
+    sink.register("a", disconnected)
+    sink.register("b", shown.extend)
+    batch = [
+        Notification(user_id, "タイマー完了", "完了", "timer_complete", datetime.now())
+        for user_id in ("a", "b")
+    ]
+    sink.deliver(batch)
+    assert [n.user_id for n in shown] == ["b"]
+
@@ -0,0 +1,66 @@
+import gc
+
+from utils.profiling import ProfileControl
+
+
+class _Session:
+    """set_profilingの呼び出しを記録するセッション"""
+
+    def __init__(self):
+        self.calls = []
+
+    def set_profiling(self, enabled: bool):
+        self.calls.append(enabled)
+
+
+def _select(control: ProfileControl, path, *session_ids):
+    path.write_text("\n".join(session_ids) + "\n", encoding="utf-8")
+    control._mtime = -1.0  # 更新時刻の分解能に依存しないようにする
+    return control.check()
+
+
+def test_only_listed_session_is_profiled(tmp_path):
+    """ファイルに記載したセッションだけ計測を切り替える"""
+    path = tmp_path / "profile_sessions.txt"
+    control = ProfileControl(str(path))
+    a, b = _Session(), _Session()
+    control.register("a", a)
+    control.register("b", b)
+    assert control.check() == set()  # ファイルが無い場合は何もしない
+
+    assert _select(control, path, "b", "# コメント") == {"b"}
+    assert (a.calls, b.calls) == ([], [True])
+
+    # 指定の変更で、外れたセッションは無効化、追加されたセッションは有効化
+    assert _select(control, path, "a") == {"a", "b"}
+    assert (a.calls, b.calls) == ([True], [True, False])
+
+    # ファイルを削除するとすべて無効化
+    path.unlink()
+    assert control.check() == {"a"}
+    assert a.calls == [True, False]
+
+
+def test_session_registered_after_selection(tmp_path):
+    """先に指定されたセッションは、登録時に計測を開始する"""
+    path = tmp_path / "profile_sessions.txt"
+    control = ProfileControl(str(path))
+    _select(control, path, "late")
+
+    session = _Session()
+    control.register("late", session)
+    assert session.calls == [True]
+
+    control.unregister("late")
+    path.unlink()
+    assert control.check() == set()
+    assert session.calls == [True]
+
+
+def test_discarded_session_is_dropped(tmp_path):
+    """破棄されたセッションは登録から外れる"""
+    path = tmp_path / "profile_sessions.txt"
+    control = ProfileControl(str(path))
+    control.register("gone", _Session())
+    gc.collect()
+    assert _select(control, path, "gone") == set()
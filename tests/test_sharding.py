@@ -0,0 +1,62 @@
+import asyncio
+
+from utils.sharding import SHARD_COOKIE, ShardProxy
+
+
+async def _start_backend(name: bytes):
+    """リクエストに自分の名前を返すだけのワーカー"""
+    async def handle(reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(name), name)
+        )
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+async def _request(port: int, cookie: str = "") -> bytes:
+    """プロキシにリクエストを送り、応答全体を返す"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    headers = f"Cookie: {cookie}\r\n" if cookie else ""
+    writer.write(f"GET / HTTP/1.1\r\nHost: test\r\n{headers}\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return response
+
+
+def test_proxy_pins_clients_by_cookie():
+    """Cookieの無い接続は割り当てたワーカーをCookieで返し、以降はそのワーカーに送る"""
+    async def scenario():
+        first, first_port = await _start_backend(b"first")
+        second, second_port = await _start_backend(b"second")
+        proxy = ShardProxy([("127.0.0.1", first_port), ("127.0.0.1", second_port)])
+        server = await asyncio.start_server(proxy.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            assigned = await _request(port)
+            pinned = await _request(port, f"theme=dark; {SHARD_COOKIE}=1")
+            invalid = await _request(port, f"{SHARD_COOKIE}=9")
+        finally:
+            for s in (server, first, second):
+                s.close()
+        return assigned, pinned, invalid
+
+    assigned, pinned, invalid = asyncio.run(scenario())
+
+    assert assigned.startswith(b"HTTP/1.1 200 OK\r\nSet-Cookie: timer_shard=0;")
+    assert assigned.endswith(b"first")
+    assert b"Set-Cookie" not in pinned
+    assert pinned.endswith(b"second")
+    # 存在しないワーカー番号の場合は割り当て直す
+    assert b"Set-Cookie: timer_shard=" in invalid
+
+
+def test_new_clients_go_to_least_busy_worker():
+    """新しいクライアントは接続数が最も少ないワーカーに割り当てられる"""
+    proxy = ShardProxy([("127.0.0.1", 1), ("127.0.0.1", 2), ("127.0.0.1", 3)])
+    proxy._active = [2, 0, 1]
+    assert proxy.choose() == 1
@@ -0,0 +1,82 @@
+import random
+import statistics
+import time
+
+from utils.task_index import TaskIndex
+
+
+def test_terms_match_substrings_at_every_length():
+    """検索語の長さによらず、トークンの途中にも一致する"""
+    index = TaskIndex()
+    index.add(1, "資料作成", "仕事")
+    index.add(2, "会議の準備")
+    index.add(3, "Write report")
+
+    assert index.search("作成") == {1}
+    assert index.search("準備") == {2}
+    assert index.search("po") == {3}
+    assert index.search("por") == {3}
+    assert index.search("事", category="仕事") == {1}
+
+
+def test_removed_task_is_no_longer_found():
+    """削除したタスクは短い語でも長い語でも一致しない"""
+    index = TaskIndex()
+    index.add(1, "資料作成")
+    index.remove(1)
+
+    assert index.search("作") == set()
+    assert index.search("資料作成") == set()
+
+
+# 実際のタスク名に近い、同じ語が繰り返し現れる語彙
+_VOCABULARY = [
+    "report", "reports", "reporting", "meeting", "review", "design", "plan",
+    "planning", "email", "code", "refactor", "deploy", "docs", "budget",
+    "client", "資料作成", "会議", "準備", "打ち合わせ", "レビュー", "設計", "実装",
+]
+_CATEGORIES = ["仕事", "学習", "個人", None]
+
+
+def _build(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    index = TaskIndex()
+    tasks = {}
+    for task_id in range(count):
+        title = " ".join(rng.choice(_VOCABULARY) for _ in range(rng.randint(1, 4)))
+        if rng.random() < 0.3:
+            title += f" {rng.randint(1, 500)}"
+        category = rng.choice(_CATEGORIES)
+        index.add(task_id, title, category)
+        tasks[task_id] = (title, category)
+    return index, tasks
+
+
+def test_matches_substring_search_on_repeated_vocabulary():
+    """語彙が重複していても、単純な部分一致と同じ結果を返す"""
+    index, tasks = _build(2000)
+    for task_id in range(0, 2000, 7):
+        index.remove(task_id)
+        del tasks[task_id]
+
+    for query in ["rep", "report", "ports", "eport", "資料作成", "料作", "review design",
+                  "plan 12", "準備 会議", "ew", "xyz", "ortrep"]:
+        terms = query.split()
+        expected = {
+            task_id for task_id, (title, category) in tasks.items()
+            if all(term in f"{title} {category or ''}" for term in terms)
+        }
+        assert index.search(query) == expected, query
+
+
+def test_search_100000_tasks_with_common_words_under_5ms():
+    """一般的な語が多数のタスクに一致する場合でも、10万件を5ミリ秒未満で検索できる"""
+    index, _tasks = _build(100000)
+
+    for query in ["rep", "report", "meeting", "資料作成", "review design"]:
+        durations = []
+        for _ in range(11):
+            started = time.perf_counter()
+            index.search(query)
+            durations.append(time.perf_counter() - started)
+        assert statistics.median(durations) < 0.005, query
@@ -0,0 +1,37 @@
+import json
+
+import pytest
+
+from utils.theme_config import DEFAULT_THEME, ThemeWatcher, load_theme
+
+
+def _write(path, overrides) -> str:
+    path.write_text(json.dumps(overrides), encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("key, value", [
+    ("update_interval", 0),
+    ("update_interval", -1),
+    ("update_interval", 0.001),
+    ("update_interval", float("nan")),
+    ("timer_font_size", 0),
+    ("unit_font_size", -16),
+    ("icon_size", 0),
+])
+def test_rejects_values_below_minimum(tmp_path, key, value):
+    """0以下の大きさや短すぎる更新間隔は読み込まない"""
+    with pytest.raises(ValueError):
+        load_theme(_write(tmp_path / "theme.json", {key: value}))
+
+
+def test_invalid_update_keeps_current_theme(tmp_path):
+    """不正な値を含む設定に更新されても、現在のテーマを維持する"""
+    path = _write(tmp_path / "theme.json", {"update_interval": 0.2, "icon_size": 40})
+    watcher = ThemeWatcher(path)
+    assert watcher.check() == {"update_interval": 0.2, "icon_size": 40}
+
+    _write(tmp_path / "theme.json", {"update_interval": 0, "icon_size": 48})
+    watcher._mtime = None  # 更新時刻の分解能に依存しないようにする
+    assert watcher.check() == {}
+    assert watcher.current == dict(DEFAULT_THEME, update_interval=0.2, icon_size=40)
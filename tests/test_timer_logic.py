@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+import time
+
+from utils.timer_logic import TimerLogic
+
+
+def _run_for(logic: TimerLogic, seconds: float):
+    """指定した秒数だけ実行してから一時停止する"""
+    assert logic.start(1)
+    time.sleep(seconds)
+    logic.pause()
+
+
+def test_pause_and_resume_keep_sub_second_elapsed_time():
+    """一時停止と再開を繰り返しても1秒未満の経過時間が失われない"""
+    ticks = []
+    logic = TimerLogic(ticks.append, lambda: None, update_interval=0.01)
+
+    # 0.4秒ずつ3回実行すると合計1.2秒経過し、残りは59秒になる
+    for _ in range(3):
+        _run_for(logic, 0.4)
+        assert not logic.is_running
+        assert logic.deadline is None
+        time.sleep(0.2)  # 一時停止中の時間は経過時間に含めない
+
+    assert 1.2 <= logic._paused_elapsed < 1.5
+    assert logic.remaining_seconds == 59
+
+    # 一時停止後はタイマースレッドが更新を止めている
+    count = len(ticks)
+    time.sleep(0.1)
+    assert len(ticks) == count
+    logic.reset()
+
+
+def test_deadline_accounts_for_time_before_pause():
+    """再開後の完了予定時刻は一時停止までの経過時間を差し引いた時刻になる"""
+    logic = TimerLogic(lambda remaining: None, lambda: None, update_interval=0.01)
+    _run_for(logic, 0.5)
+    elapsed = logic._paused_elapsed
+
+    assert logic.start(1)
+    expected = datetime.now() + timedelta(seconds=60 - elapsed)
+    assert abs((logic.deadline - expected).total_seconds()) < 0.05
+    assert logic.remaining_seconds == 60
+    logic.reset()
+    assert logic.deadline is None
+    assert logic.remaining_seconds == 0